@@ -19,8 +19,11 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 # target_metadata = None
 
-from app.models import SQLModel  # noqa
-from app.core.config import settings # noqa
+from app.models import SQLModel, load_all_models  # noqa
+from app.core.config import get_settings # noqa
+
+# Register every table on the metadata for autogenerate
+load_all_models()
 
 target_metadata = SQLModel.metadata
 
@@ -32,7 +35,7 @@ target_metadata = SQLModel.metadata
 
 def get_url():
     """Get database URL from settings."""
-    return str(settings.DATABASE_URL)
+    return str(get_settings().DATABASE_URL)
 
 
 def run_migrations_offline():
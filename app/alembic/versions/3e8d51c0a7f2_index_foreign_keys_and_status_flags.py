@@ -0,0 +1,50 @@
+"""index_foreign_keys_and_status_flags
+
+Revision ID: 3e8d51c0a7f2
+Revises: 7c2f4e1a9b30
+Create Date: 2026-10-15 22:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # Ensure sqlmodel is imported
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8d51c0a7f2'
+down_revision: Union[str, None] = '7c2f4e1a9b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs indexed via index=True on the models
+INDEXED_COLUMNS = (
+    ('districts', 'province_id'),
+    ('facilities', 'province_id'),
+    ('facilities', 'district_id'),
+    ('facilities', 'is_active'),
+    ('fiscal_years', 'is_current'),
+    ('programs', 'is_active'),
+    ('activity_categories', 'program_id'),
+    ('activity_categories', 'is_active'),
+    ('activity_types', 'category_id'),
+    ('activity_types', 'is_active'),
+    ('user_profiles', 'province_id'),
+    ('user_profiles', 'district_id'),
+    ('user_profiles', 'facility_id'),
+    ('password_reset_tokens', 'user_id'),
+)
+
+
+def upgrade() -> None:
+    for table, column in INDEXED_COLUMNS:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+    # Reverse lookup for the facility/program link table (created as
+    # 'facility_program' by 038abc6353c5); its primary key leads with facility_id
+    op.create_index('ix_fp_program', 'facility_program', ['program_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fp_program', table_name='facility_program')
+    for table, column in reversed(INDEXED_COLUMNS):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
@@ -0,0 +1,42 @@
+"""cascade_child_foreign_keys
+
+Revision ID: 4b7c9e2d0f18
+Revises: 3e8d51c0a7f2
+Create Date: 2026-10-15 22:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # Ensure sqlmodel is imported
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7c9e2d0f18'
+down_revision: Union[str, None] = '3e8d51c0a7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table); the link table is named
+# 'facility_program' in the migration history
+CASCADING_FOREIGN_KEYS = (
+    ('districts', 'province_id', 'provinces'),
+    ('activity_categories', 'program_id', 'programs'),
+    ('activity_types', 'category_id', 'activity_categories'),
+    ('facility_program', 'facility_id', 'facilities'),
+    ('facility_program', 'program_id', 'programs'),
+)
+
+
+def upgrade() -> None:
+    for table, column, referred in CASCADING_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    for table, column, referred in CASCADING_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'])
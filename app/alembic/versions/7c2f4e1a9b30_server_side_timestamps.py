@@ -0,0 +1,57 @@
+"""server_side_timestamps
+
+Revision ID: 7c2f4e1a9b30
+Revises: eb61e5aeaf22
+Create Date: 2026-10-15 22:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # Ensure sqlmodel is imported
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f4e1a9b30'
+down_revision: Union[str, None] = 'eb61e5aeaf22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every table that inherits created_at/updated_at from BaseModel
+TIMESTAMPED_TABLES = (
+    'provinces',
+    'districts',
+    'fiscal_years',
+    'programs',
+    'activity_categories',
+    'activity_types',
+    'facilities',
+    'users',
+    'user_profiles',
+    'password_reset_tokens',
+)
+
+
+def upgrade() -> None:
+    # Existing values were written with datetime.utcnow, so read them as UTC
+    for table in TIMESTAMPED_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column,
+                existing_type=sa.DateTime(),
+                type_=sa.DateTime(timezone=True),
+                existing_nullable=False,
+                server_default=sa.text('now()'),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    for table in TIMESTAMPED_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column,
+                existing_type=sa.DateTime(timezone=True),
+                type_=sa.DateTime(),
+                existing_nullable=False,
+                server_default=None,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
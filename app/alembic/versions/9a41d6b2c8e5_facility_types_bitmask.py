@@ -0,0 +1,45 @@
+"""facility_types_bitmask
+
+Revision ID: 9a41d6b2c8e5
+Revises: 4b7c9e2d0f18
+Create Date: 2026-10-15 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # Ensure sqlmodel is imported
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9a41d6b2c8e5'
+down_revision: Union[str, None] = '4b7c9e2d0f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# hospital = 1, health_center = 2 (see app.models.program.FACILITY_TYPE_BITS)
+TABLES = ('activity_categories', 'activity_types')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('facility_types_mask', sa.SmallInteger(), server_default='3', nullable=False))
+        op.execute(
+            f"UPDATE {table} SET facility_types_mask = "
+            "(CASE WHEN 'hospital' = ANY(facility_types) THEN 1 ELSE 0 END) "
+            "| (CASE WHEN 'health_center' = ANY(facility_types) THEN 2 ELSE 0 END)"
+        )
+        op.drop_column(table, 'facility_types')
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('facility_types', postgresql.ARRAY(sa.String(length=20)), server_default='{hospital,health_center}', nullable=False))
+        op.execute(
+            f"UPDATE {table} SET facility_types = array_remove(ARRAY["
+            "CASE WHEN facility_types_mask & 1 <> 0 THEN 'hospital' END, "
+            "CASE WHEN facility_types_mask & 2 <> 0 THEN 'health_center' END"
+            "]::varchar(20)[], NULL)"
+        )
+        op.drop_column(table, 'facility_types_mask')
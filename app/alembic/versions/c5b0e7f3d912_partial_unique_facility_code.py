@@ -0,0 +1,30 @@
+"""partial_unique_facility_code
+
+Revision ID: c5b0e7f3d912
+Revises: 9a41d6b2c8e5
+Create Date: 2026-10-15 22:55:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # Ensure sqlmodel is imported
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5b0e7f3d912'
+down_revision: Union[str, None] = '9a41d6b2c8e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Replace the full unique constraint with an index over non-null codes only
+    op.drop_constraint('facilities_code_key', 'facilities', type_='unique')
+    op.create_index('uq_facility_code', 'facilities', ['code'], unique=True,
+                    postgresql_where=sa.text('code IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('uq_facility_code', table_name='facilities')
+    op.create_unique_constraint('facilities_code_key', 'facilities', ['code'])
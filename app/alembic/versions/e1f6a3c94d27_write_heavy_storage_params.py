@@ -0,0 +1,32 @@
+"""write_heavy_storage_params
+
+Revision ID: e1f6a3c94d27
+Revises: c5b0e7f3d912
+Create Date: 2026-10-15 23:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # Ensure sqlmodel is imported
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f6a3c94d27'
+down_revision: Union[str, None] = 'c5b0e7f3d912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables updated in place (see WRITE_HEAVY_STORAGE_PARAMS in app.models.base);
+# the link table is named 'facility_program' in the migration history
+TABLES = ('users', 'password_reset_tokens', 'facility_program')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = 90, autovacuum_vacuum_scale_factor = 0.05)")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor, autovacuum_vacuum_scale_factor)")
@@ -1,16 +1,29 @@
 """Application configuration."""
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
-from pydantic import AnyHttpUrl, EmailStr, PostgresDsn, validator
-from pydantic_settings import BaseSettings
+from dotenv import dotenv_values
+from pydantic import PostgresDsn, field_validator, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+import json
+import os
 import secrets
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",  # This will ignore extra fields
+        defer_build=True,  # Build the validator on first instantiation, not at import
+    )
+
     # API Settings
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12
     
     # Project Info
     PROJECT_NAME: str = "HIV Program Activities Tracker"
@@ -26,15 +39,19 @@ class Settings(BaseSettings):
     ASYNC_DATABASE_URL: Optional[str] = None
     
     # CORS
-    BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
+    BACKEND_CORS_ORIGINS: List[str] = []
     
     # Logging
     LOG_LEVEL: str = "INFO"
     
-    @validator("BACKEND_CORS_ORIGINS", pre=True)
+    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @classmethod
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str) and not v.startswith("["):
             return [i.strip() for i in v.split(",")]
+        elif isinstance(v, str):
+            # JSON list given as a raw string (e.g. passed in from get_settings)
+            return json.loads(v)
         elif isinstance(v, (list, str)):
             return v
         raise ValueError(v)
@@ -45,104 +62,125 @@ class Settings(BaseSettings):
     SMTP_HOST: Optional[str] = None
     SMTP_USER: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
-    EMAILS_FROM_EMAIL: Optional[EmailStr] = None
+    # Plain str so email-validator is only imported when emails are enabled
+    EMAILS_FROM_EMAIL: Optional[str] = None
     EMAILS_FROM_NAME: Optional[str] = None
     EMAIL_TEMPLATES_DIR: str = "app/email-templates/build"
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
     EMAILS_ENABLED: bool = False
 
-    @validator("EMAILS_FROM_NAME")
-    def get_project_name(cls, v: Optional[str], values: dict) -> str:
-        if not v:
-            return values.get("PROJECT_NAME", "HIV Program Tracker")
-        return v
-
-    @validator("EMAILS_ENABLED", pre=True)
-    def get_emails_enabled(cls, v: bool, values: dict) -> bool:
-        return bool(
-            values.get("SMTP_HOST")
-            and values.get("SMTP_PORT")
-            and values.get("EMAILS_FROM_EMAIL")
-        )
+    @model_validator(mode="after")
+    def get_project_name(self) -> "Settings":
+        if not self.EMAILS_FROM_NAME:
+            self.EMAILS_FROM_NAME = self.PROJECT_NAME
+        return self
 
-    @validator("DATABASE_URL", pre=True)
-    def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
-        if isinstance(v, str):
-            return v
-        return PostgresDsn.build(
-            scheme="postgresql",
-            username=values.get("POSTGRES_USER"),
-            password=values.get("POSTGRES_PASSWORD"),
-            host=values.get("POSTGRES_SERVER"),
-            path=f"/{values.get('POSTGRES_DB') or ''}",
+    @model_validator(mode="after")
+    def get_emails_enabled(self) -> "Settings":
+        self.EMAILS_ENABLED = bool(
+            self.SMTP_HOST and self.SMTP_PORT and self.EMAILS_FROM_EMAIL
         )
+        if self.EMAILS_ENABLED:
+            from email_validator import validate_email
+
+            self.EMAILS_FROM_EMAIL = validate_email(
+                self.EMAILS_FROM_EMAIL, check_deliverability=False
+            ).normalized
+        return self
+
+    @model_validator(mode="after")
+    def assemble_db_connection(self) -> "Settings":
+        if self.DATABASE_URL is None:
+            self.DATABASE_URL = PostgresDsn.build(
+                scheme="postgresql",
+                username=self.POSTGRES_USER,
+                password=self.POSTGRES_PASSWORD,
+                host=self.POSTGRES_SERVER,
+                path=self.POSTGRES_DB or "",
+            )
+        if self.ASYNC_DATABASE_URL is None:
+            # Replace postgresql:// with postgresql+asyncpg://
+            self.ASYNC_DATABASE_URL = str(self.DATABASE_URL).replace(
+                "postgresql://", "postgresql+asyncpg://"
+            )
+        return self
 
-    @validator("ASYNC_DATABASE_URL")
-    def assemble_async_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> str:
-        if isinstance(v, str):
-            return v
-        db_url = values.get("DATABASE_URL")
-        if not db_url:
-            return None
-        # Replace postgresql:// with postgresql+asyncpg://
-        return str(db_url).replace("postgresql://", "postgresql+asyncpg://")
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "ignore"  # This will ignore extra fields
+@lru_cache(maxsize=1)
+def _read_environment() -> Dict[str, str]:
+    """Read the .env file once and overlay the process environment on it."""
+    env_file = Path(Settings.model_config["env_file"])
+    values = {
+        key: value
+        for key, value in (dotenv_values(env_file) if env_file.exists() else {}).items()
+        if value is not None
+    }
+    # Real environment variables take precedence over the .env file
+    values.update(os.environ)
+    return values
 
 
-# Create settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, building them on first use.
+
+    Can be used directly or as a FastAPI dependency via ``Depends(get_settings)``.
+    """
+    environment = _read_environment()
+    return Settings(
+        _env_file=None,
+        **{key: value for key, value in environment.items() if key in Settings.model_fields},
+    )
 
 
 # Database URL validation
+@lru_cache(maxsize=1)
 def get_database_url() -> str:
-    """Get the appropriate database URL based on environment."""
-    if settings.ENVIRONMENT == "testing" and settings.ASYNC_DATABASE_URL:
-        return settings.ASYNC_DATABASE_URL
-    return settings.DATABASE_URL
+    """Get the async (driver-qualified) database URL used by the application engines."""
+    return get_settings().ASYNC_DATABASE_URL
 
 
 # Logging configuration
-LOGGING_CONFIG = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "default": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        },
-        "detailed": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s",
-        },
-    },
-    "handlers": {
-        "default": {
-            "formatter": "default",
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
+def get_logging_config() -> Dict[str, Any]:
+    """Build the logging dictConfig for the current settings."""
+    settings = get_settings()
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {
+                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            },
+            "detailed": {
+                "format": "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s",
+            },
         },
-        "detailed": {
-            "formatter": "detailed",
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
+        "handlers": {
+            "default": {
+                "formatter": "default",
+                "class": "logging.StreamHandler",
+                "stream": "ext://sys.stdout",
+            },
+            "detailed": {
+                "formatter": "detailed",
+                "class": "logging.StreamHandler",
+                "stream": "ext://sys.stdout",
+            },
         },
-    },
-    "root": {
-        "level": settings.LOG_LEVEL,
-        "handlers": ["default"],
-    },
-    "loggers": {
-        "app": {
+        "root": {
             "level": settings.LOG_LEVEL,
-            "handlers": ["detailed"],
-            "propagate": False,
-        },
-        "sqlalchemy.engine": {
-            "level": "WARNING" if settings.ENVIRONMENT == "production" else "INFO",
             "handlers": ["default"],
-            "propagate": False,
         },
-    },
-}
\ No newline at end of file
+        "loggers": {
+            "app": {
+                "level": settings.LOG_LEVEL,
+                "handlers": ["detailed"],
+                "propagate": False,
+            },
+            "sqlalchemy.engine": {
+                "level": "WARNING" if settings.ENVIRONMENT == "production" else "INFO",
+                "handlers": ["default"],
+                "propagate": False,
+            },
+        },
+    }
@@ -1,29 +1,134 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Dict, List, Optional
+from sqlalchemy import event, inspect, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel
 import logging
 
-from app.core.config import get_database_url, settings
-from app.models import *
+from app.core.config import get_database_url, get_settings
 
 logger = logging.getLogger(__name__)
 
+_models_loaded = False
+
+
+def _ensure_models_loaded() -> None:
+    """Import the model modules so their tables are registered on SQLModel.metadata."""
+    global _models_loaded
+    if _models_loaded:
+        return
+    from app.models import load_all_models
+    load_all_models()
+    _models_loaded = True
+
+
+_DB_URL = get_database_url()
+_IS_SQLITE = _DB_URL.startswith("sqlite")
+
+
+def _connect_args(url: str) -> dict:
+    """Driver-specific arguments passed to every new DBAPI connection."""
+    if url.startswith("sqlite"):
+        return {"check_same_thread": False}
+    if url.startswith("postgresql+asyncpg"):
+        return {
+            # asyncpg keeps prepared statements per connection (default 100);
+            # together with query_cache_size this skips both SQL compilation
+            # and server-side PREPARE for hot statements.
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 1024,
+            # Sent in the startup packet, so no extra round trip per connection;
+            # JIT compilation only slows down short OLTP queries.
+            "server_settings": {
+                "jit": "off",
+                "application_name": get_settings().PROJECT_NAME,
+            },
+        }
+    return {}
+
+
+def _configure_sqlite(engine: AsyncEngine) -> None:
+    """
+    Make SQLite enforce foreign keys and honour SAVEPOINTs.
+
+    pysqlite (and aiosqlite on top of it) defers BEGIN until the first DML
+    statement, which breaks SAVEPOINT/nested transactions; SQLAlchemy's
+    recommended fix is to turn off the driver's transaction handling and
+    emit BEGIN ourselves. Foreign keys (and so ON DELETE CASCADE) are off
+    per connection unless enabled with a PRAGMA.
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def create_db_engine(url: Optional[str] = None, **kwargs: Any) -> AsyncEngine:
+    """
+    Create an async engine with the project's pool and statement cache defaults.
+    Scripts and tests should build their engines here rather than calling
+    create_async_engine directly; keyword arguments override the defaults.
+    Driver connect arguments (asyncpg statement caches, JIT off) are added
+    from the URL unless connect_args is given.
+    """
+    url = url or _DB_URL
+    options: Dict[str, Any] = {
+        "future": True,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        # Compiled SQL kept per engine (SQLAlchemy default is 500)
+        "query_cache_size": 1200,
+        "connect_args": _connect_args(url),
+    }
+    if url.startswith("sqlite"):
+        # For testing with in-memory databases
+        options["poolclass"] = StaticPool
+    options.update(kwargs)
+    if options.get("poolclass") is not None:
+        # Only QueuePool is sized; NullPool/StaticPool reject these arguments
+        options.pop("pool_size", None)
+        options.pop("max_overflow", None)
+    db_engine = create_async_engine(url, **options)
+    if url.startswith("sqlite"):
+        _configure_sqlite(db_engine)
+    return db_engine
+
+
 # Create async engine
-engine = create_async_engine(
-    get_database_url(),
-    echo=settings.ENVIRONMENT == "development",
-    future=True,
+engine = create_db_engine(
+    echo=get_settings().ENVIRONMENT == "development",
     # Connection pool settings
     pool_size=20,
     max_overflow=0,
-    pool_pre_ping=True,
     pool_recycle=300,
-    # For testing with in-memory databases
-    poolclass=StaticPool if "sqlite" in get_database_url() else None,
-    connect_args={
-        "check_same_thread": False
-    } if "sqlite" in get_database_url() else {},
+)
+
+# Single-connection engine reserved for health probes, so /health neither
+# competes with request traffic for the main pool nor reports unhealthy just
+# because that pool is saturated. In-memory SQLite is one connection per
+# engine, so there the main engine is reused.
+health_engine = engine if _IS_SQLITE else create_db_engine(
+    pool_size=1,
+    max_overflow=0,
 )
 
 # Create async session factory
@@ -35,21 +140,35 @@ AsyncSessionLocal = async_sessionmaker(
     autocommit=False,
 )
 
+# Identifier of the HTTP request being served, set by RequestScopeMiddleware
+request_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# One session per request, shared by every dependency of that request
+ScopedSession = async_scoped_session(AsyncSessionLocal, scopefunc=request_ctx.get)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function that yields db sessions.
     Use this in FastAPI dependencies.
+    Within a request the session is shared through ScopedSession; outside
+    of one (scripts, background jobs) a standalone session is used.
     """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        except Exception as e:
-            logger.error(f"Database session error: {e}")
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    if request_ctx.get() is None:
+        session = AsyncSessionLocal()
+        release = session.close
+    else:
+        session = ScopedSession()
+        release = ScopedSession.remove
+
+    try:
+        yield session
+    except Exception as e:
+        logger.error("Database session error: %s", e)
+        await session.rollback()
+        raise
+    finally:
+        await release()
 
 
 async def init_db() -> None:
@@ -59,13 +178,8 @@ async def init_db() -> None:
     """
     try:
         # Import all models here to ensure they are registered with SQLModel
-        from app.models.user import User, UserProfile, PasswordResetToken
-        from app.models.geography import Province, District, Facility
-        from app.models.program import Program, FiscalYear, ActivityCategory, ActivityType
-        from app.models.planning import Plan, PlanActivity
-        from app.models.execution import Execution, ExecutionItem
-        from app.models.audit import AuditLog
-        
+        _ensure_models_loaded()
+
         logger.info("Creating database tables...")
         
         async with engine.begin() as conn:
@@ -75,7 +189,7 @@ async def init_db() -> None:
         logger.info("Database tables created successfully")
         
     except Exception as e:
-        logger.error(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
         raise
 
 
@@ -86,36 +200,82 @@ async def close_db() -> None:
     """
     try:
         await engine.dispose()
+        if health_engine is not engine:
+            await health_engine.dispose()
         logger.info("Database connections closed")
     except Exception as e:
-        logger.error(f"Error closing database: {e}")
+        logger.error("Error closing database: %s", e)
 
 
 # Database health check
+_PING = text("SELECT 1")
+
+
 async def check_db_health() -> bool:
     """
     Check if database is accessible.
     Returns True if healthy, False otherwise.
     """
     try:
-        async with AsyncSessionLocal() as session:
-            # Simple query to check connection
-            result = await session.execute("SELECT 1")
+        # Ping on a bare connection; no ORM session is needed for this
+        async with health_engine.connect() as conn:
+            result = await conn.execute(_PING)
             return result.scalar() == 1
     except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+        logger.error("Database health check failed: %s", e)
         return False
 
 
+# Seconds a health probe result is reused before the database is probed again
+HEALTH_TTL = 2.0
+# Seconds a probe may take before the database is reported unhealthy
+HEALTH_TIMEOUT = 1.5
+_health_cache = {"ts": 0.0, "ok": False}
+_health_lock = asyncio.Lock()
+
+
+async def check_db_health_cached() -> bool:
+    """
+    Same as check_db_health, but reuses the last result for HEALTH_TTL seconds.
+    Concurrent callers share a single probe when the cached result expires.
+    A probe taking longer than HEALTH_TIMEOUT counts as unhealthy.
+    """
+    if time.monotonic() - _health_cache["ts"] < HEALTH_TTL:
+        return _health_cache["ok"]
+    async with _health_lock:
+        # Another caller may have refreshed it while we waited for the lock
+        if time.monotonic() - _health_cache["ts"] < HEALTH_TTL:
+            return _health_cache["ok"]
+        try:
+            ok = await asyncio.wait_for(check_db_health(), timeout=HEALTH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error("Database health check timed out after %ss", HEALTH_TIMEOUT)
+            ok = False
+        _health_cache["ok"] = ok
+        _health_cache["ts"] = time.monotonic()
+        return ok
+
+
 # Transaction decorator for service layer
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Tuple
+
+# Session owned by the outermost @transactional call in the current context,
+# together with the task that opened it
+_current_session: ContextVar[Optional[Tuple[AsyncSession, Optional[asyncio.Task]]]] = ContextVar(
+    "current_session", default=None
+)
 
 
 def transactional(func: Callable) -> Callable:
     """
     Decorator to wrap service methods in database transactions.
     Automatically commits on success, rolls back on exception.
+    Nested calls in the same task join the outer transaction instead of
+    opening a new session. Tasks spawned inside the block (create_task,
+    gather) inherit the context variable but not the session: an
+    AsyncSession must not be used concurrently or after the outer block
+    has closed it, so they get a session and transaction of their own.
     """
     @wraps(func)
     async def wrapper(*args, **kwargs) -> Any:
@@ -123,9 +283,16 @@ def transactional(func: Callable) -> Callable:
         if 'session' in kwargs and kwargs['session'] is not None:
             # Session already provided, don't create new transaction
             return await func(*args, **kwargs)
+
+        # Reuse the session of an enclosing @transactional call in this task
+        current = _current_session.get()
+        if current is not None and current[1] is asyncio.current_task():
+            kwargs['session'] = current[0]
+            return await func(*args, **kwargs)
         
         # Create new session and transaction
         async with AsyncSessionLocal() as session:
+            token = _current_session.set((session, asyncio.current_task()))
             try:
                 kwargs['session'] = session
                 result = await func(*args, **kwargs)
@@ -133,8 +300,10 @@ def transactional(func: Callable) -> Callable:
                 return result
             except Exception as e:
                 await session.rollback()
-                logger.error(f"Transaction rolled back due to error: {e}")
+                logger.error("Transaction rolled back due to error: %s", e)
                 raise
+            finally:
+                _current_session.reset(token)
     
     return wrapper
 
@@ -161,7 +330,7 @@ class DatabaseSession:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if exc_type is not None:
             await self.session.rollback()
-            logger.error(f"Database session rolled back due to: {exc_val}")
+            logger.error("Database session rolled back due to: %s", exc_val)
         else:
             await self.session.commit()
         
@@ -194,6 +363,9 @@ async def get_or_create(session: AsyncSession, model, **kwargs):
 async def bulk_insert_or_update(session: AsyncSession, model, data_list: list, update_on_conflict=True):
     """
     Bulk insert or update records.
+
+    Builds one model instance per row and returns them after a flush. For
+    large batches of plain dicts, see bulk_upsert_rows.
     """
     if not data_list:
         return []
@@ -208,4 +380,66 @@ async def bulk_insert_or_update(session: AsyncSession, model, data_list: list, u
     
     session.add_all(instances)
     await session.flush()
-    return instances
\ No newline at end of file
+    return instances
+
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+async def bulk_upsert_rows(
+    session: AsyncSession, model, rows: List[dict]
+) -> List[Tuple[Any, ...]]:
+    """
+    Upsert plain dict rows in a single statement and return their primary keys.
+
+    Every row must supply the same columns. Columns whose value comes from a
+    Python-side default_factory (e.g. User.id) are filled in here, since the
+    statement bypasses model construction. On PostgreSQL and SQLite this is
+    one multi-row INSERT ... ON CONFLICT on the primary key that overwrites
+    only the columns the caller supplied; other dialects fall back to
+    session.merge(). Primary keys are returned in row order.
+    """
+    if not rows:
+        return []
+
+    columns = set(rows[0])
+    if any(set(row) != columns for row in rows):
+        raise ValueError("All rows passed to bulk_upsert_rows must have the same keys")
+
+    table = model.__table__
+    factories = {
+        name: field.default_factory
+        for name, field in model.model_fields.items()
+        if field.default_factory is not None
+        and name in table.columns
+        and name not in columns
+    }
+    rows = [
+        {**row, **{name: factory() for name, factory in factories.items()}}
+        for row in rows
+    ]
+
+    pk_columns = list(table.primary_key.columns)
+    insert = _DIALECT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is None:
+        identities = []
+        for row in rows:
+            instance = await session.merge(model(**row))
+            await session.flush()
+            identities.append(inspect(instance).identity)
+        return identities
+
+    stmt = insert(table).values(rows)
+    pk_names = {column.name for column in pk_columns}
+    update_columns = {
+        name: stmt.excluded[name] for name in columns if name not in pk_names
+    }
+    # A no-op update (rather than DO NOTHING) keeps conflicting rows in RETURNING
+    if not update_columns:
+        update_columns = {column.name: stmt.excluded[column.name] for column in pk_columns}
+    stmt = stmt.on_conflict_do_update(index_elements=pk_columns, set_=update_columns)
+    result = await session.execute(stmt.returning(*pk_columns))
+    return [tuple(row) for row in result]
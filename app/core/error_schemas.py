@@ -0,0 +1,43 @@
+"""Error response models for OpenAPI documentation.
+
+Kept apart from app.core.exceptions so that raising and handling errors
+does not require building these pydantic schemas; only route modules that
+declare ``responses=COMMON_RESPONSES`` import this module.
+"""
+from typing import Any, Dict
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ErrorDetail(BaseModel):
+    message: str
+    code: str
+    details: Dict[str, Any] = {}
+
+
+class ErrorResponse(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "error": {
+                    "message": "Resource not found",
+                    "code": "NOT_FOUND",
+                    "details": {"resource": "User"}
+                }
+            }
+        }
+    )
+
+    error: ErrorDetail
+
+
+# Common error responses for OpenAPI
+COMMON_RESPONSES = {
+    400: {"model": ErrorResponse, "description": "Bad Request"},
+    401: {"model": ErrorResponse, "description": "Unauthorized"},
+    403: {"model": ErrorResponse, "description": "Forbidden"},
+    404: {"model": ErrorResponse, "description": "Not Found"},
+    409: {"model": ErrorResponse, "description": "Conflict"},
+    422: {"model": ErrorResponse, "description": "Validation Error"},
+    500: {"model": ErrorResponse, "description": "Internal Server Error"},
+}
@@ -1,145 +1,177 @@
-from typing import Any, Dict, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Union
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exception_handlers import http_exception_handler
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
+# Shared, read-only details mapping for exceptions raised without details
+_EMPTY_DETAILS: Mapping[str, Any] = MappingProxyType({})
+
+
 # Custom Exception Classes
 class BaseAPIException(Exception):
-    """Base exception class for all API exceptions."""
-    
+    """Base exception class for all API exceptions.
+
+    Subclasses declare their status_code, error_code and default_message
+    as class attributes; instances only store what differs.
+    """
+
+    status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
+    error_code: Optional[str] = None
+    default_message: str = "An error occurred"
+
     def __init__(
         self,
-        message: str = "An error occurred",
-        status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR,
+        message: Optional[str] = None,
+        status_code: Optional[int] = None,
         details: Optional[Dict[str, Any]] = None,
         error_code: Optional[str] = None,
     ):
-        self.message = message
-        self.status_code = status_code
-        self.details = details or {}
-        self.error_code = error_code
+        self.message = message or self.default_message
+        if status_code is not None:
+            self.status_code = status_code
+        if error_code is not None:
+            self.error_code = error_code
+        self.details = details if details is not None else _EMPTY_DETAILS
         super().__init__(self.message)
 
 
 class ValidationError(BaseAPIException):
     """Raised when validation fails."""
-    
-    def __init__(self, message: str = "Validation failed", details: Optional[Dict] = None):
-        super().__init__(
-            message=message,
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            details=details,
-            error_code="VALIDATION_ERROR"
-        )
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    error_code = "VALIDATION_ERROR"
+    default_message = "Validation failed"
+
+    def __init__(self, message: Optional[str] = None, details: Optional[Dict] = None):
+        super().__init__(message=message, details=details)
 
 
 class NotFoundError(BaseAPIException):
     """Raised when a resource is not found."""
-    
-    def __init__(self, message: str = "Resource not found", resource: Optional[str] = None):
-        details = {"resource": resource} if resource else {}
+
+    status_code = status.HTTP_404_NOT_FOUND
+    error_code = "NOT_FOUND"
+    default_message = "Resource not found"
+
+    def __init__(self, message: Optional[str] = None, resource: Optional[str] = None):
         super().__init__(
             message=message,
-            status_code=status.HTTP_404_NOT_FOUND,
-            details=details,
-            error_code="NOT_FOUND"
+            details={"resource": resource} if resource else None,
         )
 
 
 class AuthenticationError(BaseAPIException):
     """Raised when authentication fails."""
-    
-    def __init__(self, message: str = "Authentication failed"):
-        super().__init__(
-            message=message,
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            error_code="AUTHENTICATION_ERROR"
-        )
+
+    status_code = status.HTTP_401_UNAUTHORIZED
+    error_code = "AUTHENTICATION_ERROR"
+    default_message = "Authentication failed"
 
 
 class AuthorizationError(BaseAPIException):
     """Raised when authorization fails."""
-    
-    def __init__(self, message: str = "Insufficient permissions"):
-        super().__init__(
-            message=message,
-            status_code=status.HTTP_403_FORBIDDEN,
-            error_code="AUTHORIZATION_ERROR"
-        )
+
+    status_code = status.HTTP_403_FORBIDDEN
+    error_code = "AUTHORIZATION_ERROR"
+    default_message = "Insufficient permissions"
 
 
 class ConflictError(BaseAPIException):
     """Raised when there's a conflict with existing data."""
-    
-    def __init__(self, message: str = "Resource conflict", resource: Optional[str] = None):
-        details = {"resource": resource} if resource else {}
+
+    status_code = status.HTTP_409_CONFLICT
+    error_code = "CONFLICT_ERROR"
+    default_message = "Resource conflict"
+
+    def __init__(self, message: Optional[str] = None, resource: Optional[str] = None):
         super().__init__(
             message=message,
-            status_code=status.HTTP_409_CONFLICT,
-            details=details,
-            error_code="CONFLICT_ERROR"
+            details={"resource": resource} if resource else None,
         )
 
 
 class BusinessLogicError(BaseAPIException):
     """Raised when business logic validation fails."""
-    
-    def __init__(self, message: str = "Business logic validation failed", details: Optional[Dict] = None):
-        super().__init__(
-            message=message,
-            status_code=status.HTTP_400_BAD_REQUEST,
-            details=details,
-            error_code="BUSINESS_LOGIC_ERROR"
-        )
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    error_code = "BUSINESS_LOGIC_ERROR"
+    default_message = "Business logic validation failed"
+
+    def __init__(self, message: Optional[str] = None, details: Optional[Dict] = None):
+        super().__init__(message=message, details=details)
 
 
 class DatabaseError(BaseAPIException):
     """Raised when database operations fail."""
-    
-    def __init__(self, message: str = "Database operation failed", operation: Optional[str] = None):
-        details = {"operation": operation} if operation else {}
+
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    error_code = "DATABASE_ERROR"
+    default_message = "Database operation failed"
+
+    def __init__(self, message: Optional[str] = None, operation: Optional[str] = None):
         super().__init__(
             message=message,
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            details=details,
-            error_code="DATABASE_ERROR"
+            details={"operation": operation} if operation else None,
         )
 
 
 class ExternalServiceError(BaseAPIException):
     """Raised when external service calls fail."""
-    
-    def __init__(self, message: str = "External service error", service: Optional[str] = None):
-        details = {"service": service} if service else {}
+
+    status_code = status.HTTP_502_BAD_GATEWAY
+    error_code = "EXTERNAL_SERVICE_ERROR"
+    default_message = "External service error"
+
+    def __init__(self, message: Optional[str] = None, service: Optional[str] = None):
         super().__init__(
             message=message,
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            details=details,
-            error_code="EXTERNAL_SERVICE_ERROR"
+            details={"service": service} if service else None,
         )
 
 
 class RateLimitError(BaseAPIException):
     """Raised when rate limits are exceeded."""
-    
-    def __init__(self, message: str = "Rate limit exceeded"):
-        super().__init__(
-            message=message,
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            error_code="RATE_LIMIT_ERROR"
-        )
+
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    error_code = "RATE_LIMIT_ERROR"
+    default_message = "Rate limit exceeded"
+
+
+# Pre-encoded body for errors whose details are always empty; only the
+# message and code are serialised per response.
+_EMPTY_DETAILS_ERROR_TEMPLATE = b'{"error":{"message":%b,"code":%b,"details":{}}}'
+
+
+def _fast_error_response(
+    status_code: int,
+    message: Any,
+    code: str,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Build an error response with empty details from the pre-encoded template."""
+    content = _EMPTY_DETAILS_ERROR_TEMPLATE % (orjson.dumps(message), orjson.dumps(code))
+    return Response(
+        content=content,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
 
 
 # Exception Handlers
-async def api_exception_handler(request: Request, exc: BaseAPIException) -> JSONResponse:
+async def api_exception_handler(request: Request, exc: BaseAPIException) -> ORJSONResponse:
     """Handler for custom API exceptions."""
     
     logger.error(
-        f"API Exception: {exc.error_code} - {exc.message}",
+        "API Exception: %s - %s",
+        exc.error_code,
+        exc.message,
         extra={
             "error_code": exc.error_code,
             "status_code": exc.status_code,
@@ -149,36 +181,39 @@ async def api_exception_handler(request: Request, exc: BaseAPIException) -> JSON
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": {
                 "message": exc.message,
                 "code": exc.error_code,
-                "details": exc.details,
+                "details": exc.details or {},
                 "timestamp": str(exc.__class__.__name__),
             }
         },
     )
 
 
-async def validation_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handler for Pydantic validation exceptions."""
     from pydantic import ValidationError as PydanticValidationError
     
     if isinstance(exc, PydanticValidationError):
+        errors = exc.errors()
         logger.warning(
-            f"Validation error on {request.url.path}: {exc.errors()}",
-            extra={"validation_errors": exc.errors()}
+            "Validation error on %s: %s",
+            request.url.path,
+            errors,
+            extra={"validation_errors": errors}
         )
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={
                 "error": {
                     "message": "Validation failed",
                     "code": "VALIDATION_ERROR",
-                    "details": {"validation_errors": exc.errors()},
+                    "details": {"validation_errors": errors},
                 }
             },
         )
@@ -187,11 +222,13 @@ async def validation_exception_handler(request: Request, exc: Exception) -> JSON
     raise exc
 
 
-async def http_exception_override_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_override_handler(request: Request, exc: HTTPException) -> Response:
     """Override default HTTP exception handler to maintain consistent error format."""
     
     logger.warning(
-        f"HTTP Exception: {exc.status_code} - {exc.detail}",
+        "HTTP Exception: %s - %s",
+        exc.status_code,
+        exc.detail,
         extra={
             "status_code": exc.status_code,
             "path": request.url.path,
@@ -199,23 +236,20 @@ async def http_exception_override_handler(request: Request, exc: HTTPException)
         }
     )
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "error": {
-                "message": exc.detail,
-                "code": "HTTP_ERROR",
-                "details": {},
-            }
-        },
-    )
+    headers = getattr(exc, "headers", None)
+    if exc.status_code in {204, 304}:
+        # These statuses must not carry a body
+        return Response(status_code=exc.status_code, headers=headers)
+    return _fast_error_response(exc.status_code, exc.detail, "HTTP_ERROR", headers)
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> Response:
     """Handler for unexpected exceptions."""
     
     logger.error(
-        f"Unexpected error on {request.url.path}: {str(exc)}",
+        "Unexpected error on %s: %s",
+        request.url.path,
+        exc,
         exc_info=True,
         extra={
             "path": request.url.path,
@@ -223,15 +257,8 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         }
     )
     
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "error": {
-                "message": "Internal server error",
-                "code": "INTERNAL_ERROR",
-                "details": {},
-            }
-        },
+    return _fast_error_response(
+        status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error", "INTERNAL_ERROR"
     )
 
 
@@ -263,41 +290,3 @@ def raise_validation_error(field: str, message: str) -> None:
 def raise_business_logic_error(message: str, **details) -> None:
     """Convenience function to raise BusinessLogicError."""
     raise BusinessLogicError(message=message, details=details)
-
-
-# Error response models for OpenAPI documentation
-from pydantic import BaseModel
-from typing import Any
-
-
-class ErrorDetail(BaseModel):
-    message: str
-    code: str
-    details: Dict[str, Any] = {}
-
-
-class ErrorResponse(BaseModel):
-    error: ErrorDetail
-    
-    class Config:
-        schema_extra = {
-            "example": {
-                "error": {
-                    "message": "Resource not found",
-                    "code": "NOT_FOUND",
-                    "details": {"resource": "User"}
-                }
-            }
-        }
-
-
-# Common error responses for OpenAPI
-COMMON_RESPONSES = {
-    400: {"model": ErrorResponse, "description": "Bad Request"},
-    401: {"model": ErrorResponse, "description": "Unauthorized"},
-    403: {"model": ErrorResponse, "description": "Forbidden"},
-    404: {"model": ErrorResponse, "description": "Not Found"},
-    409: {"model": ErrorResponse, "description": "Conflict"},
-    422: {"model": ErrorResponse, "description": "Validation Error"},
-    500: {"model": ErrorResponse, "description": "Internal Server Error"},
-}
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""ASGI middleware for the application."""
+import abc
+from typing import Iterable, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database import ScopedSession, request_ctx
+
+
+class PureASGIMiddleware(abc.ABC):
+    """
+    Base class for middleware written against raw ASGI messages.
+
+    Unlike BaseHTTPMiddleware this builds no Request/Response objects and
+    spawns no extra tasks per request. Subclasses implement ``handle`` for
+    HTTP scopes; websocket and lifespan scopes go straight to the app.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.handle(scope, receive, send)
+
+    @abc.abstractmethod
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process an HTTP request."""
+
+
+class RequestScopeMiddleware(PureASGIMiddleware):
+    """Tag each HTTP request with an id so ScopedSession can share one session per request."""
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        token = request_ctx.set(uuid4().hex)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Drop the request's session even if no dependency released it
+            await ScopedSession.remove()
+            request_ctx.reset(token)
+
+
+class StaticCORSMiddleware(PureASGIMiddleware):
+    """
+    CORS for a fixed list of allowed origins, with credentials allowed.
+
+    Preflight requests from an allowed origin are answered directly; other
+    requests from an allowed origin get the CORS headers appended to the
+    response start message. Requests without an Origin header pass through
+    untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_origins: Iterable[str],
+        allow_methods: Sequence[str] = ("GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"),
+        max_age: int = 600,
+    ) -> None:
+        super().__init__(app)
+        self.allowed_origins = frozenset(
+            origin.rstrip("/").encode("latin-1") for origin in allowed_origins
+        )
+        self.allow_methods = ", ".join(allow_methods).encode("latin-1")
+        self.max_age = str(max_age).encode("latin-1")
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Match on the raw header bytes; ASGI header names are lowercase
+        origin = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+                break
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = origin in self.allowed_origins
+        if scope["method"] == "OPTIONS":
+            request_method = request_headers = None
+            for name, value in scope["headers"]:
+                if name == b"access-control-request-method":
+                    request_method = value
+                elif name == b"access-control-request-headers":
+                    request_headers = value
+            if request_method is not None:
+                await self._preflight(send, origin if allowed else None, request_headers or b"")
+                return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = self._simple_headers(origin)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _simple_headers(self, origin: bytes) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def _preflight(self, send: Send, origin: Optional[bytes], request_headers: bytes) -> None:
+        if origin is None:
+            status, body = 400, b"Disallowed CORS origin"
+            response_headers = [(b"vary", b"Origin")]
+        else:
+            status, body = 200, b"OK"
+            response_headers = self._simple_headers(origin) + [
+                (b"access-control-allow-methods", self.allow_methods),
+                (b"access-control-max-age", self.max_age),
+            ]
+            if request_headers:
+                # Any request header is allowed, so echo back what was asked for
+                response_headers.append((b"access-control-allow-headers", request_headers))
+        response_headers += [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,16 +1,30 @@
 # Standard library imports
-from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+import hashlib
+import threading
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, Union, Optional
 
 # Third-party imports
-from jose import jwt, JWTError
+import anyio.to_thread
+import jwt
+from cachetools import TTLCache
+from jwt import InvalidTokenError as JWTError
 from passlib.context import CryptContext
 
 # Local imports
-from app.core.config import settings
+from app.core.config import get_settings
 
 # Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=1)
+def get_pwd_context() -> CryptContext:
+    """Returns the shared bcrypt context, built on first use."""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=get_settings().BCRYPT_ROUNDS,
+    )
 
 ALGORITHM = "HS256"
 
@@ -19,36 +33,87 @@ def create_access_token(
     expires_delta: Optional[timedelta] = None
 ) -> str:
     """Creates a new JWT access token."""
+    settings = get_settings()
+    # JWT "exp" is an integer NumericDate, so compute it directly in seconds.
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode = {"exp": expire, "sub": str(subject)}
+        lifetime = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    to_encode = {"exp": int(time.time()) + lifetime, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hashes a plain password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Async variant of verify_password that runs bcrypt in a worker thread."""
+    return await anyio.to_thread.run_sync(verify_password, plain_password, hashed_password)
+
+async def aget_password_hash(password: str) -> str:
+    """Async variant of get_password_hash that runs bcrypt in a worker thread."""
+    return await anyio.to_thread.run_sync(get_password_hash, password)
 
 # Functions for JWT validation (e.g., to be used in deps.py)
 # We might move the actual dependency that uses this to deps.py later
 
+# Decoded payloads keyed by a digest of the raw token, so repeat requests
+# with the same access token skip signature verification.
+_token_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _get_token_cache() -> TTLCache:
+    """Returns the decoded-token cache, sized to the access token lifetime."""
+    return TTLCache(
+        maxsize=10_000, ttl=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+
+def _token_cache_key(token: str, secret_key: str) -> bytes:
+    # The signing key and algorithm are part of the key, so a SECRET_KEY or
+    # ALGORITHM change never serves payloads verified under the old ones.
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (ALGORITHM, secret_key, token):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.digest()
+
+def clear_token_cache() -> None:
+    """Drops all cached token payloads.
+
+    This only empties the decode cache; it revokes nothing. A token that is
+    still validly signed and unexpired decodes again on the next call, so
+    logout or revocation needs its own denylist check.
+    """
+    with _token_cache_lock:
+        _get_token_cache().clear()
+
 async def decode_token(token: str) -> Optional[str]:
     """Decodes a JWT token and returns the subject (user_id) or None if invalid."""
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
+    secret_key = get_settings().SECRET_KEY
+    key = _token_cache_key(token, secret_key)
+    cache = _get_token_cache()
+    with _token_cache_lock:
+        payload: Optional[Dict[str, Any]] = cache.get(key)
+
+    if payload is None:
+        try:
+            payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
+        except JWTError:
             return None
-        return user_id
-    except JWTError:
+        with _token_cache_lock:
+            cache[key] = payload
+    elif "exp" in payload and payload["exp"] <= time.time():
+        # jwt.decode only enforces exp when the claim is present; match that
+        with _token_cache_lock:
+            cache.pop(key, None)
+        return None
+
+    user_id: Optional[str] = payload.get("sub")
+    if user_id is None:
         return None
+    return user_id
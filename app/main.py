@@ -1,14 +1,16 @@
 import logging
 import logging.config
+import orjson
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import ValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.core.config import settings, LOGGING_CONFIG
-from app.core.database import init_db, close_db, check_db_health
+from app.core.config import get_settings, get_logging_config
+from app.core.database import init_db, close_db, check_db_health, check_db_health_cached
+from app.core.middleware import RequestScopeMiddleware, StaticCORSMiddleware
 from app.core.exceptions import (
     BaseAPIException,
     api_exception_handler,
@@ -17,8 +19,10 @@ from app.core.exceptions import (
     general_exception_handler,
 )
 
+settings = get_settings()
+
 # Configure logging
-logging.config.dictConfig(LOGGING_CONFIG)
+logging.config.dictConfig(get_logging_config())
 logger = logging.getLogger(__name__)
 
 
@@ -28,8 +32,8 @@ async def lifespan(app: FastAPI):
     Manage application lifecycle - startup and shutdown events.
     """
     # Startup
-    logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    logger.info("Starting %s v%s", settings.PROJECT_NAME, settings.VERSION)
+    logger.info("Environment: %s", settings.ENVIRONMENT)
     
     try:
         # Initialize database
@@ -43,7 +47,7 @@ async def lifespan(app: FastAPI):
             logger.warning("Database health check failed")
             
     except Exception as e:
-        logger.error(f"Failed to initialize application: {e}")
+        logger.error("Failed to initialize application: %s", e)
         raise
     
     yield
@@ -54,7 +58,7 @@ async def lifespan(app: FastAPI):
         await close_db()
         logger.info("Application shutdown completed")
     except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
+        logger.error("Error during shutdown: %s", e)
 
 
 # Create FastAPI application
@@ -65,6 +69,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.ENVIRONMENT != "production" else None,
     docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -78,15 +83,20 @@ if settings.ENVIRONMENT == "production":
 # Add CORS middleware
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
-        allow_credentials=True,
+        StaticCORSMiddleware,
+        allowed_origins=settings.BACKEND_CORS_ORIGINS,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-        allow_headers=["*"],
     )
 
+# Share one database session per request
+app.add_middleware(RequestScopeMiddleware)
+
 # Add exception handlers
+# Expected errors are matched by class in Starlette's ExceptionMiddleware,
+# right around the router; the catch-all Exception handler only runs in the
+# outermost ServerErrorMiddleware for genuinely unexpected failures.
 app.add_exception_handler(BaseAPIException, api_exception_handler)
+app.add_exception_handler(StarletteHTTPException, http_exception_override_handler)
 app.add_exception_handler(ValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
@@ -94,25 +104,29 @@ app.add_exception_handler(Exception, general_exception_handler)
 # app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+# Root info only depends on settings, so it is encoded once at import time
+_ROOT_BODY = orjson.dumps({
+    "message": f"Welcome to {settings.PROJECT_NAME}",
+    "version": settings.VERSION,
+    "environment": settings.ENVIRONMENT,
+    "docs_url": "/docs" if settings.ENVIRONMENT != "production" else None,
+    "api_version": settings.API_V1_STR,
+})
+
+
 # Health check endpoints
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": f"Welcome to {settings.PROJECT_NAME}",
-        "version": settings.VERSION,
-        "environment": settings.ENVIRONMENT,
-        "docs_url": "/docs" if settings.ENVIRONMENT != "production" else None,
-        "api_version": settings.API_V1_STR,
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint."""
     try:
-        # Check database connectivity
-        db_healthy = await check_db_health()
+        # Check database connectivity (result is cached for a couple of seconds)
+        db_healthy = await check_db_health_cached()
         
         health_status = {
             "status": "healthy" if db_healthy else "unhealthy",
@@ -122,11 +136,11 @@ async def health_check():
         }
         
         status_code = 200 if db_healthy else 503
-        return JSONResponse(content=health_status, status_code=status_code)
+        return ORJSONResponse(content=health_status, status_code=status_code)
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        logger.error("Health check failed: %s", e)
+        return ORJSONResponse(
             content={
                 "status": "unhealthy",
                 "error": "Health check failed",
@@ -1,29 +1,73 @@
-"""Model exports and initialization."""
-from sqlmodel import SQLModel
-from app.models.base import BaseModel
-from app.models.geography import Province, District
-from app.models.facility import Facility
-from app.models.program import (
-    Program,
-    FiscalYear,
-    ActivityCategory,
-    ActivityType,
+"""Model exports and initialization.
+
+Exported names are resolved on first access (PEP 562), so importing this
+package does not build any tables. Relationships refer to each other by
+class name, so the first model accessed loads every model module at once.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from sqlmodel import SQLModel
+    from app.models.base import BaseModel
+    from app.models.geography import Province, District
+    from app.models.facility import Facility
+    from app.models.program import (
+        Program,
+        FiscalYear,
+        ActivityCategory,
+        ActivityType,
+    )
+    from app.models.associations import FacilityProgram
+    from app.models.user import User, UserProfile, PasswordResetToken
+
+# Modules defining table models, in dependency order
+_MODEL_MODULES = (
+    "app.models.base",
+    "app.models.associations",
+    "app.models.geography",
+    "app.models.facility",
+    "app.models.program",
+    "app.models.user",
 )
-from app.models.associations import FacilityProgram
-from app.models.user import User, UserProfile, PasswordResetToken
-
-__all__ = [
-    "SQLModel",
-    "BaseModel",
-    "Province",
-    "District",
-    "Facility",
-    "Program",
-    "FiscalYear",
-    "ActivityCategory",
-    "ActivityType",
-    "FacilityProgram",
-    "User",
-    "UserProfile",
-    "PasswordResetToken",
-]
+
+# Exported name -> module it is defined in
+_EXPORTS = {
+    "SQLModel": "sqlmodel",
+    "BaseModel": "app.models.base",
+    "Province": "app.models.geography",
+    "District": "app.models.geography",
+    "Facility": "app.models.facility",
+    "Program": "app.models.program",
+    "FiscalYear": "app.models.program",
+    "ActivityCategory": "app.models.program",
+    "ActivityType": "app.models.program",
+    "FacilityProgram": "app.models.associations",
+    "User": "app.models.user",
+    "UserProfile": "app.models.user",
+    "PasswordResetToken": "app.models.user",
+}
+
+__all__ = [*_EXPORTS, "load_all_models"]
+
+
+def load_all_models() -> None:
+    """Import every model module so all tables are registered on SQLModel.metadata."""
+    for module in _MODEL_MODULES:
+        importlib.import_module(module)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if module != "sqlmodel":
+        load_all_models()
+    value = getattr(importlib.import_module(module), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
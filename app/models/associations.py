@@ -1,24 +1,40 @@
 """Association models for many-to-many relationships."""
 
 from typing import Optional
+from sqlalchemy import Column, ForeignKey, Index, Integer
 from sqlmodel import SQLModel, Field
 
+from app.models.base import WRITE_HEAVY_STORAGE_PARAMS, set_storage_params
+
 
 class FacilityProgram(SQLModel, table=True):
     """Association table for facility-program many-to-many relationship."""
     __tablename__ = "facility_programs"
+    # The (facility_id, program_id) primary key only serves lookups by facility
+    __table_args__ = (Index("ix_fp_program", "program_id"),)
 
+    # Link rows go away with either side (ON DELETE CASCADE)
     facility_id: Optional[int] = Field(
         default=None,
-        foreign_key="facilities.id",
-        primary_key=True
+        sa_column=Column(
+            Integer,
+            ForeignKey("facilities.id", ondelete="CASCADE"),
+            primary_key=True
+        )
     )
     program_id: Optional[int] = Field(
         default=None,
-        foreign_key="programs.id",
-        primary_key=True
+        sa_column=Column(
+            Integer,
+            ForeignKey("programs.id", ondelete="CASCADE"),
+            primary_key=True
+        )
     )
     is_active: bool = Field(
         default=True,
         description="Whether the program is active for this facility"
-    ) 
\ No newline at end of file
+    ) 
+
+
+# is_active is toggled in place
+set_storage_params(FacilityProgram.__table__, **WRITE_HEAVY_STORAGE_PARAMS)
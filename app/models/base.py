@@ -1,24 +1,58 @@
 """Base model class with common fields for all models."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
+from sqlalchemy import DDL, DateTime, Table, event, func
 from sqlmodel import SQLModel, Field
 
+# Storage parameters for tables whose rows are updated often: free space in
+# each page lets PostgreSQL keep updates on the same page (HOT updates), and
+# autovacuum runs earlier to clear the dead row versions.
+WRITE_HEAVY_STORAGE_PARAMS = {
+    "fillfactor": 90,
+    "autovacuum_vacuum_scale_factor": 0.05,
+}
+
+
+def set_storage_params(table: Table, **params: Union[int, float]) -> None:
+    """Apply PostgreSQL storage parameters to a table right after it is created.
+
+    SQLAlchemy has no table-level WITH (...) option, so this emits
+    ALTER TABLE ... SET (...) on create; other dialects are unaffected.
+    """
+    options = ", ".join(f"{name} = {value}" for name, value in params.items())
+    event.listen(
+        table,
+        "after_create",
+        DDL(f"ALTER TABLE %(fullname)s SET ({options})").execute_if(dialect="postgresql"),
+    )
+
 
 class BaseModel(SQLModel):
     """Base model class that all other models should inherit from.
     
     Provides common fields like id, created_at, and updated_at.
+    The timestamps are filled in by the database (server defaults), so
+    they are None on a new instance until it has been flushed.
+    eager_defaults fetches them back during the flush (RETURNING where
+    supported); otherwise the UPDATE would leave updated_at expired and
+    reading it under AsyncSession would need an implicit lazy load.
     """
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
         nullable=False,
         description="Timestamp when the record was created"
     )
-    updated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
         nullable=False,
         description="Timestamp when the record was last updated"
     )
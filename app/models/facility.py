@@ -2,7 +2,7 @@
 
 from typing import List, Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship
-from sqlalchemy import Column, String, CheckConstraint
+from sqlalchemy import Column, String, CheckConstraint, Index, text
 
 from app.models.base import BaseModel
 from app.models.associations import FacilityProgram
@@ -15,6 +15,16 @@ if TYPE_CHECKING:
 class Facility(BaseModel, table=True):
     """Facility model representing a healthcare facility."""
     __tablename__ = "facilities"
+    # Codes are optional; only the rows that have one are indexed
+    __table_args__ = (
+        Index(
+            "uq_facility_code",
+            "code",
+            unique=True,
+            postgresql_where=text("code IS NOT NULL"),
+            sqlite_where=text("code IS NOT NULL"),
+        ),
+    )
 
     name: str = Field(
         max_length=200,
@@ -23,7 +33,6 @@ class Facility(BaseModel, table=True):
     )
     code: Optional[str] = Field(
         max_length=20,
-        unique=True,
         description="Unique code for the facility"
     )
     facility_type: str = Field(
@@ -39,6 +48,7 @@ class Facility(BaseModel, table=True):
     )
     is_active: bool = Field(
         default=True,
+        index=True,
         description="Whether the facility is currently active"
     )
 
@@ -46,20 +56,32 @@ class Facility(BaseModel, table=True):
     province_id: int = Field(
         foreign_key="provinces.id",
         nullable=False,
+        index=True,
         description="ID of the province this facility belongs to"
     )
     district_id: int = Field(
         foreign_key="districts.id",
         nullable=False,
+        index=True,
         description="ID of the district this facility belongs to"
     )
 
     # Relationships
-    province: "Province" = Relationship(back_populates="facilities")
-    district: "District" = Relationship(back_populates="facilities")
+    # Related rows must be loaded explicitly (e.g. selectinload) in queries;
+    # an implicit lazy load raises instead of issuing a query per row.
+    province: "Province" = Relationship(
+        back_populates="facilities",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
+    district: "District" = Relationship(
+        back_populates="facilities",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
+    # Link rows are removed by ON DELETE CASCADE, so deletes need not load them
     programs: List["Program"] = Relationship(
         back_populates="facilities",
-        link_model=FacilityProgram
+        link_model=FacilityProgram,
+        sa_relationship_kwargs={"lazy": "raise_on_sql", "passive_deletes": True}
     )
 
     # __table_args__ removed for now to rely on individual FKs
@@ -1,6 +1,7 @@
 """Geographic models for provinces and districts."""
 
 from typing import List, Optional, TYPE_CHECKING
+from sqlalchemy import Column, ForeignKey, Integer
 from sqlmodel import Field, Relationship
 
 from app.models.base import BaseModel
@@ -28,10 +29,16 @@ class Province(BaseModel, table=True):
     # Relationships
     districts: List["District"] = Relationship(
         back_populates="province",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+        # Districts are removed by ON DELETE CASCADE, so deletes need not load them
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "lazy": "raise_on_sql",
+            "passive_deletes": True,
+        }
     )
     facilities: List["Facility"] = Relationship(
-        back_populates="province"
+        back_populates="province",
+        sa_relationship_kwargs={"lazy": "raise_on_sql", "passive_deletes": True}
     )
 
 
@@ -49,13 +56,21 @@ class District(BaseModel, table=True):
         description="Unique code for the district"
     )
     province_id: int = Field(
-        foreign_key="provinces.id",
-        nullable=False,
+        sa_column=Column(
+            Integer,
+            ForeignKey("provinces.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True
+        ),
         description="ID of the province this district belongs to"
     )
 
     # Relationships
-    province: Province = Relationship(back_populates="districts")
+    province: Province = Relationship(
+        back_populates="districts",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
     facilities: List["Facility"] = Relationship(
-        back_populates="district"
+        back_populates="district",
+        sa_relationship_kwargs={"lazy": "raise_on_sql", "passive_deletes": True}
     )
\ No newline at end of file
@@ -1,9 +1,9 @@
 """Program and activity management models."""
 
 from datetime import date
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship, SQLModel
-from sqlalchemy import Column, Date, CheckConstraint, ARRAY, String
+from sqlalchemy import Column, Date, CheckConstraint, ForeignKey, Integer, SmallInteger
 
 from app.models.base import BaseModel
 from app.models.associations import FacilityProgram
@@ -11,6 +11,36 @@ from app.models.associations import FacilityProgram
 if TYPE_CHECKING:
     from app.models.facility import Facility
 
+# Bit assigned to each facility type in the facility_types_mask columns.
+# Filter with e.g. ActivityType.facility_types_mask.op("&")(bit) != 0
+FACILITY_TYPE_BITS = {"hospital": 1, "health_center": 2}
+ALL_FACILITY_TYPES_MASK = 3
+
+
+def facility_types_to_mask(facility_types: Iterable[str]) -> int:
+    """Encode a list of facility types as a facility_types_mask value."""
+    try:
+        return sum({FACILITY_TYPE_BITS[t] for t in facility_types})
+    except KeyError as e:
+        raise ValueError(f"Unknown facility type: {e.args[0]}") from None
+
+
+def mask_to_facility_types(mask: int) -> List[str]:
+    """Decode a facility_types_mask value into a list of facility types."""
+    return [t for t, bit in FACILITY_TYPE_BITS.items() if mask & bit]
+
+
+def _encode_facility_types_kwarg(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a facility_types=[...] constructor argument into facility_types_mask.
+
+    Table models skip validation and drop unknown keyword arguments, so
+    without this the list would be silently ignored.
+    """
+    facility_types = data.pop("facility_types", None)
+    if facility_types is not None:
+        data["facility_types_mask"] = facility_types_to_mask(facility_types)
+    return data
+
 
 class FiscalYear(BaseModel, table=True):
     """Fiscal year model for financial planning."""
@@ -39,6 +69,7 @@ class FiscalYear(BaseModel, table=True):
     )
     is_current: bool = Field(
         default=False,
+        index=True,
         description="Whether this is the current fiscal year"
     )
     is_active: bool = Field(
@@ -69,17 +100,25 @@ class Program(BaseModel, table=True):
     )
     is_active: bool = Field(
         default=True,
+        index=True,
         description="Whether the program is currently active"
     )
 
     # Relationships
+    # Child and link rows are removed by ON DELETE CASCADE, so deletes need
+    # not load these collections; implicit lazy loads raise
     facilities: List["Facility"] = Relationship(
         back_populates="programs",
-        link_model=FacilityProgram
+        link_model=FacilityProgram,
+        sa_relationship_kwargs={"lazy": "raise_on_sql", "passive_deletes": True}
     )
     activity_categories: List["ActivityCategory"] = Relationship(
         back_populates="program",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "lazy": "raise_on_sql",
+            "passive_deletes": True,
+        }
     )
 
 
@@ -101,35 +140,55 @@ class ActivityCategory(BaseModel, table=True):
         default=None,
         description="Description of the category"
     )
-    facility_types: List[str] = Field(
+    facility_types_mask: int = Field(
+        default=ALL_FACILITY_TYPES_MASK,
         sa_column=Column(
-            ARRAY(String(20)),
+            SmallInteger,
             nullable=False,
-            server_default="{hospital,health_center}"
+            server_default=str(ALL_FACILITY_TYPES_MASK)
         ),
-        description="Types of facilities this category applies to"
+        description="Bitmask of facility types this category applies to"
     )
     program_id: int = Field(
-        foreign_key="programs.id",
-        nullable=False,
+        sa_column=Column(
+            Integer,
+            ForeignKey("programs.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True
+        ),
         description="ID of the program this category belongs to"
     )
     is_active: bool = Field(
         default=True,
+        index=True,
         description="Whether the category is currently active"
     )
 
     # Relationships
-    program: Program = Relationship(back_populates="activity_categories")
+    program: Program = Relationship(
+        back_populates="activity_categories",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
     activity_types: List["ActivityType"] = Relationship(
         back_populates="category",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "lazy": "raise_on_sql",
+            "passive_deletes": True,
+        }
     )
 
-    class Config:
-        sa_relationship_kwargs = {
-            "activity_types": {"cascade": "all, delete-orphan"}
-        }
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**_encode_facility_types_kwarg(data))
+
+    @property
+    def facility_types(self) -> List[str]:
+        """Facility types this category applies to, decoded from the mask."""
+        return mask_to_facility_types(self.facility_types_mask)
+
+    @facility_types.setter
+    def facility_types(self, value: List[str]) -> None:
+        self.facility_types_mask = facility_types_to_mask(value)
 
 
 class ActivityType(BaseModel, table=True):
@@ -151,27 +210,43 @@ class ActivityType(BaseModel, table=True):
         description="Description of the activity type"
     )
     category_id: int = Field(
-        foreign_key="activity_categories.id",
-        nullable=False,
+        sa_column=Column(
+            Integer,
+            ForeignKey("activity_categories.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True
+        ),
         description="ID of the category this activity type belongs to"
     )
-    facility_types: List[str] = Field(
+    facility_types_mask: int = Field(
+        default=ALL_FACILITY_TYPES_MASK,
         sa_column=Column(
-            ARRAY(String(20)),
+            SmallInteger,
             nullable=False,
-            server_default="{hospital,health_center}"
+            server_default=str(ALL_FACILITY_TYPES_MASK)
         ),
-        description="Types of facilities this activity applies to"
+        description="Bitmask of facility types this activity applies to"
     )
     is_active: bool = Field(
         default=True,
+        index=True,
         description="Whether the activity type is currently active"
     )
 
     # Relationships
-    category: ActivityCategory = Relationship(back_populates="activity_types")
+    category: ActivityCategory = Relationship(
+        back_populates="activity_types",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
 
-    class Config:
-        sa_relationship_kwargs = {
-            "category": {"lazy": "joined"}
-        }
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**_encode_facility_types_kwarg(data))
+
+    @property
+    def facility_types(self) -> List[str]:
+        """Facility types this activity applies to, decoded from the mask."""
+        return mask_to_facility_types(self.facility_types_mask)
+
+    @facility_types.setter
+    def facility_types(self, value: List[str]) -> None:
+        self.facility_types_mask = facility_types_to_mask(value)
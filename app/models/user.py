@@ -5,7 +5,8 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from sqlmodel import Field, Relationship, SQLModel
-from app.models.base import BaseModel
+from app.models.base import BaseModel, WRITE_HEAVY_STORAGE_PARAMS, set_storage_params
+from app.utils.helpers import generate_reset_token, uuid7
 
 if TYPE_CHECKING:
     from app.models.geography import Province, District
@@ -16,9 +17,9 @@ class User(BaseModel, table=True):
     """User model for authentication and basic user information."""
     __tablename__ = "users"
 
-    # Override id from BaseModel to use UUID
+    # Override id from BaseModel to use a time-ordered UUID
     id: uuid.UUID = Field(
-        default_factory=uuid.uuid4,
+        default_factory=uuid7,
         primary_key=True,
         index=True,
         nullable=False,
@@ -60,7 +61,8 @@ class User(BaseModel, table=True):
     # Relationships
     profile: Optional["UserProfile"] = Relationship(
         back_populates="user",
-        sa_relationship_kwargs={"uselist": False}  # One-to-one
+        # One-to-one; always needed alongside the user, so loaded with it
+        sa_relationship_kwargs={"uselist": False, "lazy": "selectin", "passive_deletes": True}
     )
     # password_reset_tokens: List["PasswordResetToken"] = Relationship(back_populates="user") # If needed
 
@@ -83,16 +85,19 @@ class UserProfile(BaseModel, table=True):
     province_id: int = Field(
         foreign_key="provinces.id", 
         nullable=False, 
+        index=True,
         description="ID of the province the user is associated with"
     )
     district_id: int = Field(
         foreign_key="districts.id", 
         nullable=False, 
+        index=True,
         description="ID of the district the user is associated with"
     )
     facility_id: int = Field(
         foreign_key="facilities.id", 
         nullable=False, 
+        index=True,
         description="ID of the facility the user is primarily associated with"
     )
     role: str = Field(
@@ -103,10 +108,15 @@ class UserProfile(BaseModel, table=True):
     )
 
     # Relationships
-    user: "User" = Relationship(back_populates="profile")
-    province: "Province" = Relationship()
-    district: "District" = Relationship()
-    facility: "Facility" = Relationship()
+    # The owning user is loaded with the profile; load the geography
+    # explicitly (selectinload), implicit lazy loads raise
+    user: "User" = Relationship(
+        back_populates="profile",
+        sa_relationship_kwargs={"lazy": "selectin"}
+    )
+    province: "Province" = Relationship(sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    district: "District" = Relationship(sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    facility: "Facility" = Relationship(sa_relationship_kwargs={"lazy": "raise_on_sql"})
 
 
 class PasswordResetToken(BaseModel, table=True):
@@ -120,9 +130,11 @@ class PasswordResetToken(BaseModel, table=True):
     user_id: uuid.UUID = Field(
         foreign_key="users.id", 
         nullable=False,
+        index=True,
         description="ID of the user this token belongs to"
     )
     token: str = Field(
+        default_factory=generate_reset_token,
         max_length=255, 
         unique=True, 
         index=True, 
@@ -140,5 +152,10 @@ class PasswordResetToken(BaseModel, table=True):
     )
 
     # Relationships
-    user: "User" = Relationship()
+    user: "User" = Relationship(sa_relationship_kwargs={"lazy": "raise_on_sql"})
     # Consider back_populates="password_reset_tokens" on User model if a list of tokens is needed there.
+
+
+# is_active/last_login_at and used_at are updated in place
+set_storage_params(User.__table__, **WRITE_HEAVY_STORAGE_PARAMS)
+set_storage_params(PasswordResetToken.__table__, **WRITE_HEAVY_STORAGE_PARAMS)
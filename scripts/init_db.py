@@ -1,35 +1,54 @@
-"""Database initialization script."""
+"""Database initialization script.
+
+Creates any missing tables. Pass --reset to drop every table first
+(destroys all data; never use against production).
+"""
+import argparse
 import asyncio
 import logging
 from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine
 
-from app.core.config import settings
+from app.core.database import create_db_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def init_db() -> None:
+async def init_db(reset: bool = False) -> None:
     """Initialize database tables."""
     try:
         # Import all SQLModel models here
-        from app.models import Province, District  # noqa
+        from app.models import load_all_models
+        load_all_models()
 
         # Create async engine
-        engine = create_async_engine(str(settings.ASYNC_DATABASE_URL))
+        engine = create_db_engine()
 
-        # Create all tables
+        # Create all tables in a single transaction
         async with engine.begin() as conn:
-            await conn.run_sync(SQLModel.metadata.drop_all)
-            await conn.run_sync(SQLModel.metadata.create_all)
+            if reset:
+                logger.warning("Dropping all tables (--reset)")
+                await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all, checkfirst=True)
 
+        await engine.dispose()
         logger.info("Database tables created successfully")
 
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error("Error creating database tables: %s", e)
         raise
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create the database tables.")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="drop all tables before creating them (deletes all data)",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(init_db())
+    args = parse_args()
+    asyncio.run(init_db(reset=args.reset))
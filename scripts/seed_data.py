@@ -8,11 +8,11 @@ import asyncio
 import json
 import logging
 from pathlib import Path
+from sqlalchemy import insert
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import settings
+from app.core.database import create_db_engine
 from app.models import Province, District
 
 logging.basicConfig(level=logging.INFO)
@@ -25,7 +25,7 @@ DATA_FILE = SCRIPT_DIR / "province_district_hospitals.json"
 
 async def get_db_session() -> AsyncSession:
     """Create database session."""
-    engine = create_async_engine(str(settings.ASYNC_DATABASE_URL))
+    engine = create_db_engine()
     async_session = sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
     )
@@ -41,35 +41,40 @@ async def seed_data() -> None:
                 data = json.load(f)
 
         # Create database session
-        engine = create_async_engine(str(settings.ASYNC_DATABASE_URL))
+        engine = create_db_engine()
         async_session = sessionmaker(
             engine, class_=AsyncSession, expire_on_commit=False
         )
         
         async with async_session() as session:
-            # Create provinces and districts
-            for province_data in data["provinces"]:
-                # Create province
-                province = Province(
-                    name=province_data["name"],
-                    code=province_data["code"]
-                )
-                session.add(province)
-                await session.commit()
-                await session.refresh(province)
-                
-                logger.info(f"Created province: {province.name}")
+            # Create all provinces, flushing once to get their IDs
+            provinces = [
+                Province(name=province_data["name"], code=province_data["code"])
+                for province_data in data["provinces"]
+            ]
+            session.add_all(provinces)
+            await session.flush()
+            logger.info("Created %d provinces", len(provinces))
 
-                # Create districts for this province
-                for district_data in province_data["districts"]:
-                    district = District(
-                        name=district_data["name"],
-                        code=district_data["code"],
-                        province_id=province.id
-                    )
-                    session.add(district)
-                    await session.commit()
-                    logger.info(f"Created district: {district.name}")
+            # Insert the districts of every province as plain rows in one
+            # batched INSERT ... RETURNING, bypassing the unit of work
+            district_rows = [
+                {
+                    "name": district_data["name"],
+                    "code": district_data["code"],
+                    "province_id": province.id,
+                }
+                for province, province_data in zip(provinces, data["provinces"])
+                for district_data in province_data["districts"]
+            ]
+            result = await session.execute(
+                insert(District).returning(District.id), district_rows
+            )
+            district_ids = result.scalars().all()
+            logger.info("Created %d districts", len(district_ids))
+
+            # Everything is written in a single transaction
+            await session.commit()
 
         logger.info("Data seeding completed successfully")
 
@@ -0,0 +1,113 @@
+"""Tests for the database helpers in app.core.database."""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import database
+from app.core.database import bulk_insert_or_update, bulk_upsert_rows, transactional
+from app.models import Province, User
+
+
+@pytest.mark.asyncio
+async def test_transactional_reuses_session_only_within_the_same_task(setup_database, monkeypatch):
+    """Test that nested calls share the outer session but spawned tasks get their own."""
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        async_sessionmaker(setup_database, class_=AsyncSession, expire_on_commit=False),
+    )
+
+    @transactional
+    async def inner(session=None):
+        return session
+
+    @transactional
+    async def outer(session=None):
+        nested = await inner()
+        spawned = await asyncio.create_task(inner())
+        gathered = await asyncio.gather(inner(), inner())
+        return session, nested, spawned, gathered
+
+    session, nested, spawned, gathered = await outer()
+
+    assert nested is session
+    assert spawned is not session
+    assert all(task_session is not session for task_session in gathered)
+    assert gathered[0] is not gathered[1]
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_or_update_returns_model_instances(db_session):
+    """Test that bulk_insert_or_update still returns flushed model instances."""
+    instances = await bulk_insert_or_update(
+        db_session, Province, [{"name": "Instance Province", "code": "IP"}]
+    )
+
+    assert isinstance(instances[0], Province)
+    assert instances[0].id is not None
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rows_returns_primary_keys_in_order(db_session):
+    """Test that bulk_upsert_rows inserts every row and returns their primary keys."""
+    rows = [{"name": f"Upsert Province {i}", "code": f"UP{i}"} for i in range(3)]
+
+    keys = await bulk_upsert_rows(db_session, Province, rows)
+
+    result = await db_session.execute(
+        select(Province.id, Province.code).where(Province.code.like("UP%"))
+    )
+    codes_by_id = dict(result.all())
+    assert [codes_by_id[key[0]] for key in keys] == ["UP0", "UP1", "UP2"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rows_only_overwrites_supplied_columns(db_session):
+    """Test that a conflicting row updates the supplied columns and keeps the rest."""
+    province = Province(name="Original Name", code="ON")
+    db_session.add(province)
+    await db_session.flush()
+
+    keys = await bulk_upsert_rows(
+        db_session, Province, [{"id": province.id, "name": "Renamed"}]
+    )
+
+    assert keys == [(province.id,)]
+    result = await db_session.execute(
+        select(Province.name, Province.code).where(Province.id == province.id)
+    )
+    assert result.one() == ("Renamed", "ON")
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rows_rejects_rows_with_different_keys(db_session):
+    """Test that rows supplying different columns are refused."""
+    with pytest.raises(ValueError):
+        await bulk_upsert_rows(
+            db_session,
+            Province,
+            [{"name": "Keyed A", "code": "KA"}, {"name": "Keyed B"}],
+        )
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rows_applies_default_factories(db_session):
+    """Test that Python-side default factories such as User.id are applied."""
+    rows = [
+        {
+            "full_name": f"Bulk User {i}",
+            "email": f"bulk_user_{i}@example.com",
+            "password_hash": "not_a_real_hash",
+        }
+        for i in range(2)
+    ]
+
+    keys = await bulk_upsert_rows(db_session, User, rows)
+
+    assert len({key[0] for key in keys}) == 2
+    assert all(isinstance(key[0], uuid.UUID) for key in keys)
@@ -0,0 +1,68 @@
+"""Tests for the HTTP exception handlers in app.core.exceptions."""
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.core.exceptions import http_exception_override_handler
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def handler_client():
+    """A bare app that raises HTTPExceptions through the override handler."""
+    test_app = FastAPI()
+    test_app.add_exception_handler(StarletteHTTPException, http_exception_override_handler)
+
+    @test_app.get("/status/{code}")
+    async def raise_status(code: int):
+        raise HTTPException(status_code=code, detail="raised", headers={"X-Reason": "test"})
+
+    return TestClient(test_app)
+
+
+def test_unknown_route_returns_error_body(client):
+    """Test that the router's own 404 uses the consistent error format."""
+    response = client.get("/does-not-exist")
+
+    assert response.status_code == 404
+    assert response.json() == {
+        "error": {"message": "Not Found", "code": "HTTP_ERROR", "details": {}}
+    }
+
+
+def test_wrong_method_returns_error_body_with_allow_header(client):
+    """Test that a 405 keeps the Allow header set by the router."""
+    response = client.post("/")
+
+    assert response.status_code == 405
+    assert response.json()["error"]["code"] == "HTTP_ERROR"
+    assert "GET" in response.headers["allow"]
+
+
+def test_raised_http_exception_keeps_its_headers(handler_client):
+    """Test that headers attached to an HTTPException reach the response."""
+    response = handler_client.get("/status/403")
+
+    assert response.status_code == 403
+    assert response.headers["x-reason"] == "test"
+    assert response.json() == {
+        "error": {"message": "raised", "code": "HTTP_ERROR", "details": {}}
+    }
+
+
+@pytest.mark.parametrize("status_code", [204, 304])
+def test_bodyless_statuses_have_no_body(handler_client, status_code):
+    """Test that 204 and 304 responses are sent without a body."""
+    response = handler_client.get(f"/status/{status_code}")
+
+    assert response.status_code == status_code
+    assert response.content == b""
+    assert "content-type" not in response.headers
+    assert response.headers["x-reason"] == "test"
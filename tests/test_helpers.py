@@ -0,0 +1,26 @@
+"""Tests for general helper functions."""
+
+import uuid
+
+from app.utils.helpers import generate_reset_token, uuid7
+
+
+def test_uuid7_is_version_7_and_time_ordered():
+    """uuid7 sets the RFC 9562 version/variant bits and sorts by creation time."""
+    first = uuid7()
+    assert isinstance(first, uuid.UUID)
+    assert first.version == 7
+    assert first.variant == uuid.RFC_4122
+
+    ids = [uuid7() for _ in range(1000)]
+    assert len(set(ids)) == len(ids)
+    # The 48-bit millisecond prefix never goes backwards
+    prefixes = [u.int >> 80 for u in ids]
+    assert prefixes == sorted(prefixes)
+
+
+def test_generate_reset_token_is_unique_and_fits_column():
+    """Reset tokens are unique and fit PasswordResetToken.token (255 chars)."""
+    tokens = {generate_reset_token() for _ in range(100)}
+    assert len(tokens) == 100
+    assert all(len(token) <= 255 for token in tokens)
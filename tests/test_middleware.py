@@ -0,0 +1,142 @@
+"""Tests for the pure ASGI middleware in app.core.middleware."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import middleware
+from app.core.database import request_ctx
+from app.core.middleware import RequestScopeMiddleware, StaticCORSMiddleware
+
+ALLOWED_ORIGIN = "http://allowed.example"
+DISALLOWED_ORIGIN = "http://other.example"
+
+
+async def homepage(request):
+    return PlainTextResponse("ok")
+
+
+async def boom(request):
+    raise RuntimeError("handler failed")
+
+
+def build_app():
+    """Wrap a tiny Starlette app in the CORS middleware."""
+    app = Starlette(routes=[Route("/", homepage)])
+    # The configured origin carries a trailing slash to exercise normalisation
+    return StaticCORSMiddleware(app, allowed_origins=[ALLOWED_ORIGIN + "/"])
+
+
+@pytest.fixture
+def client():
+    return TestClient(build_app())
+
+
+def test_simple_request_from_allowed_origin_gets_cors_headers(client):
+    """Test that an allowed origin is echoed with credentials and Vary: Origin."""
+    response = client.get("/", headers={"Origin": ALLOWED_ORIGIN})
+
+    assert response.status_code == 200
+    assert response.text == "ok"
+    assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_simple_request_from_disallowed_origin_has_no_cors_headers(client):
+    """Test that a disallowed origin reaches the app but gets no CORS headers."""
+    response = client.get("/", headers={"Origin": DISALLOWED_ORIGIN})
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_request_without_origin_passes_through(client):
+    """Test that requests without an Origin header are left untouched."""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_preflight_from_allowed_origin(client):
+    """Test that an allowed preflight is answered directly and echoes requested headers."""
+    response = client.options(
+        "/",
+        headers={
+            "Origin": ALLOWED_ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization, x-custom",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.text == "OK"
+    assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == "authorization, x-custom"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["access-control-max-age"] == "600"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_preflight_from_disallowed_origin(client):
+    """Test that a disallowed preflight is rejected with a 400."""
+    response = client.options(
+        "/",
+        headers={"Origin": DISALLOWED_ORIGIN, "Access-Control-Request-Method": "POST"},
+    )
+
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS origin"
+    assert "access-control-allow-origin" not in response.headers
+    assert response.headers["vary"] == "Origin"
+
+
+@pytest.mark.asyncio
+async def test_non_http_scopes_pass_straight_through():
+    """Test that lifespan and websocket scopes go to the wrapped app unchanged."""
+    seen = []
+
+    async def inner_app(scope, receive, send):
+        seen.append(scope)
+
+    app = StaticCORSMiddleware(inner_app, allowed_origins=[ALLOWED_ORIGIN])
+    lifespan_scope = {"type": "lifespan"}
+    websocket_scope = {"type": "websocket", "headers": [(b"origin", DISALLOWED_ORIGIN.encode())]}
+
+    await app(lifespan_scope, None, None)
+    await app(websocket_scope, None, None)
+
+    assert seen == [lifespan_scope, websocket_scope]
+
+
+def test_pure_asgi_middleware_requires_handle():
+    """Test that a subclass without handle cannot be instantiated."""
+    class Incomplete(middleware.PureASGIMiddleware):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(homepage)
+
+
+def test_request_scope_removes_session_when_handler_raises(monkeypatch):
+    """Test that RequestScopeMiddleware releases the scoped session on errors."""
+    removed = []
+
+    class FakeScopedSession:
+        @staticmethod
+        async def remove():
+            removed.append(request_ctx.get())
+
+    monkeypatch.setattr(middleware, "ScopedSession", FakeScopedSession)
+    app = Starlette(routes=[Route("/boom", boom)])
+    client = TestClient(RequestScopeMiddleware(app))
+
+    with pytest.raises(RuntimeError):
+        client.get("/boom")
+
+    assert len(removed) == 1
+    assert removed[0] is not None
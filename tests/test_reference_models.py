@@ -3,7 +3,7 @@
 import pytest
 from datetime import date
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select, text
+from sqlalchemy import insert, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import (
@@ -11,44 +11,60 @@ from app.models import (
     FiscalYear, ActivityCategory, ActivityType,
     FacilityProgram
 )
+from app.models.program import facility_types_to_mask
+
+
+async def _insert_id(session: AsyncSession, model, **values) -> int:
+    """Insert a prerequisite row with Core and return its id in one round trip."""
+    result = await session.execute(insert(model).values(**values).returning(model.id))
+    return result.scalar_one()
 
 
 @pytest.mark.asyncio
-async def test_geographic_hierarchy(db_session: AsyncSession):
-    """Test geographic hierarchy relationships and constraints."""
-    # Create province1 and district1
-    province1 = Province(name="Kigali", code="KGL")
-    db_session.add(province1)
-    await db_session.commit()
-    await db_session.refresh(province1)
-
-    district1 = District(name="Gasabo", code="GSB", province_id=province1.id)
-    db_session.add(district1)
-    await db_session.commit()
-    await db_session.refresh(district1)
+@pytest.mark.parametrize(
+    "strict_fk",
+    [
+        pytest.param(
+            True,
+            # With only the simple FKs the mismatched insert succeeds, so
+            # pytest.raises(IntegrityError) fails with "DID NOT RAISE"
+            marks=pytest.mark.xfail(
+                reason="Facility has no composite FK tying district_id to province_id",
+                raises=pytest.fail.Exception,
+                strict=True,
+            ),
+            id="strict_fk",
+        ),
+        pytest.param(False, id="simple_fk"),
+    ],
+)
+async def test_geographic_hierarchy(db_session: AsyncSession, geo_fixtures, strict_fk):
+    """Test geographic hierarchy relationships and constraints.
 
-    # Create province2 and district2
-    province2 = Province(name="Southern", code="STH")
-    db_session.add(province2)
-    await db_session.commit()
-    await db_session.refresh(province2)
+    With ``strict_fk`` a facility whose district lies in another province
+    must be rejected; the current schema only has the simple FKs, so that
+    variant is expected to fail until a composite FK is added.
+    """
+    # province1 and district1 are the shared reference rows
+    province1 = await db_session.get(Province, geo_fixtures.province_id)
+    district1 = await db_session.get(District, geo_fixtures.district_id)
 
-    district2 = District(name="Huye", code="HUY", province_id=province2.id)
-    db_session.add(district2)
-    await db_session.commit()
-    await db_session.refresh(district2)
+    # Create province2 and district2
+    province2_id = await _insert_id(db_session, Province, name="Southern", code="STH")
+    district2_id = await _insert_id(
+        db_session, District, name="Huye", code="HUY", province_id=province2_id
+    )
 
     # Valid facility creation
     facility1 = Facility(
         name="Kacyiru Hospital",
         code="KACH",
         facility_type="hospital",
-        province_id=province1.id, # Belongs to Kigali
-        district_id=district1.id  # Belongs to Gasabo (in Kigali)
+        province_id=province1.id, # Belongs to the reference province
+        district_id=district1.id  # Belongs to the reference district (in province1)
     )
     db_session.add(facility1)
-    await db_session.commit()
-    await db_session.refresh(facility1)
+    await db_session.flush()
 
     # Test basic attributes and relationships for the valid facility
     assert facility1.name == "Kacyiru Hospital"
@@ -65,68 +81,59 @@ async def test_geographic_hierarchy(db_session: AsyncSession):
     # assert retrieved_facility1.district.province_id == province1.id
 
     # Test scenario: creating a facility with mismatched province and district's province
-    # This facility is in district2 (Southern Province), but we assign it to province1 (Kigali)
-    # With the current simplified schema, this should NOT raise an IntegrityError
-    # because there's no direct composite FK enforcing this specific cross-check.
+    # This facility is in district2 (Southern Province), but we assign it to province1
     facility_with_mismatched_province = Facility(
         name="Mismatched Hospital",
         code="MISM",
         facility_type="hospital",
-        province_id=province1.id,   # Attempting to assign to Kigali (province1)
-        district_id=district2.id    # But district is Huye (in Southern, province2)
+        province_id=province1.id,   # Attempting to assign to province1
+        district_id=district2_id    # But district is Huye (in Southern, province2)
     )
+
+    if strict_fk:
+        # A composite FK (district_id, province_id) would reject the mismatch
+        with pytest.raises(IntegrityError):
+            async with db_session.begin_nested():
+                db_session.add(facility_with_mismatched_province)
+                await db_session.flush()
+        return
+
+    # With the simple FKs the mismatch is accepted at the database level
     db_session.add(facility_with_mismatched_province)
-    
-    # We expect this to succeed at the database level now.
-    # No IntegrityError should be raised based on the simplified FKs.
-    await db_session.commit()
-    await db_session.refresh(facility_with_mismatched_province)
+    await db_session.flush()
 
     # Verify it was created
     retrieved_mismatched_facility = await db_session.get(Facility, facility_with_mismatched_province.id)
     assert retrieved_mismatched_facility is not None
     assert retrieved_mismatched_facility.province_id == province1.id # It was indeed set to province1
-    assert retrieved_mismatched_facility.district_id == district2.id # And district2
+    assert retrieved_mismatched_facility.district_id == district2_id # And district2
 
     # This highlights that facility.district.province_id might not equal facility.province_id
     # We can fetch the district to confirm its actual province
     mismatched_facility_district = await db_session.get(District, retrieved_mismatched_facility.district_id)
     assert mismatched_facility_district is not None
-    assert mismatched_facility_district.province_id == province2.id # District2 is in Province2
-    
-    # The test now demonstrates that facility.province_id (province1) can be different from
-    # facility.district.province_id (province2) with the current schema.
+    assert mismatched_facility_district.province_id == province2_id # District2 is in Province2
     assert retrieved_mismatched_facility.province_id != mismatched_facility_district.province_id
-    print("Successfully created facility with mismatched province and district's province, as expected with current schema.")
 
 
 @pytest.mark.asyncio
-async def test_facility_type_constraint(db_session: AsyncSession):
+async def test_facility_type_constraint(db_session: AsyncSession, geo_fixtures):
     """Test facility type constraints."""
-    province = Province(name="Eastern", code="EST")
-    db_session.add(province)
-    await db_session.commit()
-    await db_session.refresh(province)
-    province_id = province.id
-
-    district = District(name="Rwamagana", code="RWM", province_id=province_id)
-    db_session.add(district)
-    await db_session.commit()
-    await db_session.refresh(district)
-    district_id = district.id
+    province_id = geo_fixtures.province_id
+    district_id = geo_fixtures.district_id
 
     # Test invalid facility type
     with pytest.raises(IntegrityError):
-        invalid_facility = Facility(
-            name="Invalid Facility",
-            code="INV",
-            facility_type="clinic",  # Invalid type
-            province_id=province_id,
-            district_id=district_id
-        )
-        db_session.add(invalid_facility)
-        await db_session.commit()
-    await db_session.rollback()
+        async with db_session.begin_nested():
+            invalid_facility = Facility(
+                name="Invalid Facility",
+                code="INV",
+                facility_type="clinic",  # Invalid type
+                province_id=province_id,
+                district_id=district_id
+            )
+            db_session.add(invalid_facility)
+            await db_session.flush()
 
 
 @pytest.mark.asyncio
@@ -140,35 +147,35 @@ async def test_fiscal_year_constraints(db_session: AsyncSession):
         is_current=True
     )
     db_session.add(fiscal_year)
-    await db_session.commit()
+    await db_session.flush()
 
     # Test end_date > start_date constraint
     with pytest.raises(IntegrityError):
-        invalid_fiscal_year = FiscalYear(
-            name="2024-2025",
-            start_date=date(2024, 7, 1),
-            end_date=date(2024, 6, 30),  # End before start
-            is_current=False
-        )
-        db_session.add(invalid_fiscal_year)
-        await db_session.commit()
-    await db_session.rollback()
+        async with db_session.begin_nested():
+            invalid_fiscal_year = FiscalYear(
+                name="2024-2025",
+                start_date=date(2024, 7, 1),
+                end_date=date(2024, 6, 30),  # End before start
+                is_current=False
+            )
+            db_session.add(invalid_fiscal_year)
+            await db_session.flush()
 
     # Test unique name constraint
     with pytest.raises(IntegrityError):
-        duplicate_fiscal_year = FiscalYear(
-            name="2023-2024",  # Duplicate name
-            start_date=date(2023, 7, 1),
-            end_date=date(2024, 6, 30),
-            is_current=False
-        )
-        db_session.add(duplicate_fiscal_year)
-        await db_session.commit()
-    await db_session.rollback()
+        async with db_session.begin_nested():
+            duplicate_fiscal_year = FiscalYear(
+                name="2023-2024",  # Duplicate name
+                start_date=date(2023, 7, 1),
+                end_date=date(2024, 6, 30),
+                is_current=False
+            )
+            db_session.add(duplicate_fiscal_year)
+            await db_session.flush()
 
 
 @pytest.mark.asyncio
-async def test_program_relationships(db_session: AsyncSession):
+async def test_program_relationships(db_session: AsyncSession, geo_fixtures):
     """Test program relationships and constraints."""
     # Create program
     program = Program(
@@ -177,34 +184,11 @@ async def test_program_relationships(db_session: AsyncSession):
         description="HIV/AIDS Care Program"
     )
     db_session.add(program)
-    await db_session.commit()
-    await db_session.refresh(program)
+    await db_session.flush()
     program_id = program.id
 
-    # Create facility
-    province = Province(name="Western", code="WST")
-    db_session.add(province)
-    await db_session.commit()
-    await db_session.refresh(province)
-    province_id = province.id
-
-    district = District(name="Karongi", code="KRG", province_id=province_id)
-    db_session.add(district)
-    await db_session.commit()
-    await db_session.refresh(district)
-    district_id = district.id
-
-    facility = Facility(
-        name="Karongi Hospital",
-        code="KRGH",
-        facility_type="hospital",
-        province_id=province_id,
-        district_id=district_id
-    )
-    db_session.add(facility)
-    await db_session.commit()
-    await db_session.refresh(facility)
-    facility_id = facility.id
+    # The program is deleted below, so it is created here; the facility is shared
+    facility_id = geo_fixtures.facility_id
 
     # Link facility to program
     facility_program = FacilityProgram(
@@ -213,7 +197,7 @@ async def test_program_relationships(db_session: AsyncSession):
         is_active=True
     )
     db_session.add(facility_program)
-    await db_session.commit()
+    await db_session.flush()
 
     # Test relationships by querying
     result = await db_session.execute(
@@ -228,40 +212,31 @@ async def test_program_relationships(db_session: AsyncSession):
 
     # Test cascade delete
     await db_session.delete(program)
-    await db_session.commit()
+    await db_session.flush()
     
     # Verify facility_program link is deleted
-    result = await db_session.execute(
-        select(FacilityProgram).where(FacilityProgram.program_id == program_id)
+    remaining_link = await db_session.scalar(
+        select(FacilityProgram.facility_id)
+        .where(FacilityProgram.program_id == program_id)
+        .limit(1)
     )
-    links = result.scalars().all()
-    assert len(links) == 0
+    assert remaining_link is None
 
 
 @pytest.mark.asyncio
-async def test_activity_hierarchy(db_session: AsyncSession):
+async def test_activity_hierarchy(db_session: AsyncSession, geo_fixtures):
     """Test activity category and type relationships."""
-    # Create program
-    program = Program(
-        name="TB Program",
-        code="TB",
-        description="Tuberculosis Program"
-    )
-    db_session.add(program)
-    await db_session.commit()
-    await db_session.refresh(program)
-    program_id = program.id
+    program_id = geo_fixtures.program_id
 
     # Create activity category
     category = ActivityCategory(
         name="Prevention",
         code="PREV",
         program_id=program_id,
-        facility_types=["hospital", "health_center"]
+        facility_types_mask=facility_types_to_mask(["hospital", "health_center"])
     )
     db_session.add(category)
-    await db_session.commit()
-    await db_session.refresh(category)
+    await db_session.flush()
     category_id = category.id
 
     # Create activity type
@@ -269,17 +244,17 @@ async def test_activity_hierarchy(db_session: AsyncSession):
         name="Screening",
         code="SCRN",
         category_id=category_id,
-        facility_types=["hospital", "health_center"]
+        facility_types_mask=facility_types_to_mask(["hospital", "health_center"])
     )
     db_session.add(activity_type)
-    await db_session.commit()
-    await db_session.refresh(activity_type)
+    await db_session.flush()
 
     # Test basic attributes
     assert activity_type.name == "Screening"
     assert activity_type.code == "SCRN"
     assert activity_type.category_id == category_id
     assert category.program_id == program_id
+    assert activity_type.facility_types == ["hospital", "health_center"]
 
     # Test relationships by querying
     activity_check = await db_session.get(ActivityType, activity_type.id)
@@ -291,11 +266,63 @@ async def test_activity_hierarchy(db_session: AsyncSession):
 
     # Test cascade delete
     await db_session.delete(category)
-    await db_session.commit()
+    await db_session.flush()
     
     # Verify activity type is deleted
+    remaining_type = await db_session.scalar(
+        select(ActivityType.id).where(ActivityType.category_id == category_id).limit(1)
+    )
+    assert remaining_type is None
+
+
+def test_activity_facility_types_constructor_and_setter():
+    """Test that facility_types is encoded into the mask when passed or assigned."""
+    category = ActivityCategory(
+        name="Treatment", code="TRT", program_id=1, facility_types=["hospital"]
+    )
+    activity_type = ActivityType(
+        name="ART Initiation", code="ARTI", category_id=1, facility_types=["health_center"]
+    )
+    assert category.facility_types_mask == facility_types_to_mask(["hospital"])
+    assert activity_type.facility_types_mask == facility_types_to_mask(["health_center"])
+
+    activity_type.facility_types = ["hospital", "health_center"]
+    assert activity_type.facility_types_mask == facility_types_to_mask(["hospital", "health_center"])
+    assert activity_type.facility_types == ["hospital", "health_center"]
+
+    # Unknown types are rejected rather than dropped
+    with pytest.raises(ValueError):
+        ActivityCategory(name="Bad", code="BAD", program_id=1, facility_types=["clinic"])
+
+
+@pytest.mark.asyncio
+async def test_timestamps_are_loaded_on_flush(db_session: AsyncSession):
+    """Test that server-generated timestamps are readable right after a flush."""
+    province = Province(name="Timestamp Province", code="TSP")
+    db_session.add(province)
+    await db_session.flush()
+    assert province.created_at is not None
+    assert province.updated_at is not None
+
+    # The UPDATE's onupdate value is fetched back too, so no refresh (or
+    # implicit lazy load) is needed to read it
+    province.name = "Renamed Province"
+    await db_session.flush()
+    assert province.updated_at is not None
+    assert province.updated_at >= province.created_at
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_fixture_seeds_rows(db_session: AsyncSession, bulk_insert):
+    """Test that the bulk_insert fixture writes every row in the test's transaction."""
+    rows = [{"name": f"Seeded Province {i}", "code": f"SD{i:02d}"} for i in range(25)]
+
+    await bulk_insert(Province, rows)
+
     result = await db_session.execute(
-        select(ActivityType).where(ActivityType.category_id == category_id)
+        select(Province.code, Province.created_at).where(Province.code.like("SD%"))
     )
-    activity_types = result.scalars().all()
-    assert len(activity_types) == 0
\ No newline at end of file
+    seeded = result.all()
+    assert sorted(code for code, _ in seeded) == sorted(row["code"] for row in rows)
+    # Omitted columns take their server defaults
+    assert all(created_at is not None for _, created_at in seeded)
@@ -1,17 +1,36 @@
 """Tests for security utilities in app.core.security."""
 
+import types
+
 import pytest
-from jose import jwt, JWTError
+import jwt
+import time_machine
+from jwt import InvalidTokenError as JWTError
+
+from app.core.security import (
+    clear_token_cache,
+    create_access_token,
+    decode_token,
+    get_password_hash,
+    verify_password,
+)
+from app.core.config import get_settings # To get SECRET_KEY for token tests
+import time
+
+settings = get_settings()
+
+PASSWORD = "testpassword123"
 
-from app.core.security import create_access_token, get_password_hash, verify_password
-from app.core.config import settings # To get SECRET_KEY for token tests
-import datetime
-import time # For testing token expiration
 
-def test_password_hashing_and_verification():
+@pytest.fixture(scope="module")
+def hashed_password():
+    """Hash PASSWORD once for the module; the KDF is deliberately slow."""
+    return get_password_hash(PASSWORD)
+
+
+def test_password_hashing_and_verification(hashed_password):
     """Test that password hashing and verification work correctly."""
-    password = "testpassword123"
-    hashed_password = get_password_hash(password)
+    password = PASSWORD
 
     assert hashed_password is not None
     assert password != hashed_password  # Ensure the hash is not the same as the password
@@ -20,10 +39,9 @@ def test_password_hashing_and_verification():
     assert verify_password("wrongpassword", hashed_password) is False
     assert verify_password(password, "notacorrecthash") is False
 
-def test_verify_password_with_empty_inputs():
+def test_verify_password_with_empty_inputs(hashed_password):
     """Test verify_password with empty or None inputs."""
-    password = "testpassword123"
-    hashed_password = get_password_hash(password)
+    password = PASSWORD
 
     assert verify_password("", hashed_password) is False
     assert verify_password(password, "") is False
@@ -41,57 +59,68 @@ def test_verify_password_with_empty_inputs():
 
 # JWT Token tests will be added next
 
-def test_create_and_validate_access_token():
-    """Test JWT access token creation and validation."""
-    subject = "test_user_subject"
-    token = create_access_token(subject=subject)
-
+TOKEN_SUBJECT = "test_user_subject"
+WRONG_SECRET_KEY = "a_totally_different_secret_key_that_is_long_enough"
+MALFORMED_TOKEN = "this.is.not.a.valid.token"
+
+
+@pytest.fixture(scope="session")
+def jwt_cfg():
+    """JWT settings copied once into a plain namespace for the token tests."""
+    return types.SimpleNamespace(
+        SECRET_KEY=settings.SECRET_KEY,
+        ALGORITHMS=[settings.ALGORITHM],
+        ACCESS_TOKEN_EXPIRE_MINUTES=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+    )
+
+
+@pytest.fixture(scope="module")
+def access_token(jwt_cfg):
+    """Sign one valid token, at a frozen instant, for all the decode scenarios below."""
+    issued_at = int(time.time())
+    with time_machine.travel(issued_at, tick=False):
+        token = create_access_token(subject=TOKEN_SUBJECT)
+    return token, issued_at + jwt_cfg.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+@pytest.mark.parametrize(
+    "use_valid_token, use_wrong_key, valid",
+    [
+        pytest.param(True, False, True, id="valid"),
+        pytest.param(True, True, False, id="invalid_signature"),
+        pytest.param(False, False, False, id="malformed"),
+    ],
+)
+def test_access_token_decoding(jwt_cfg, access_token, use_valid_token, use_wrong_key, valid):
+    """Test JWT access token validation against good and bad tokens and keys."""
+    token, expected_expiry = access_token
     assert token is not None
+    if not use_valid_token:
+        token = MALFORMED_TOKEN
+    key = WRONG_SECRET_KEY if use_wrong_key else jwt_cfg.SECRET_KEY
 
-    # Decode the token
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        assert payload["sub"] == subject
-        assert "exp" in payload
-        # Check that expiry is in the future (within ACCESS_TOKEN_EXPIRE_MINUTES)
-        expire_timestamp = payload["exp"]
-        expected_expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        # Allow a small leeway for timing differences
-        assert expire_timestamp > time.time()
-        assert expire_timestamp <= expected_expiry.timestamp() + 60 # 60 seconds leeway
+    if not valid:
+        with pytest.raises(JWTError):
+            jwt.decode(token, key, algorithms=jwt_cfg.ALGORITHMS)
+        return
 
+    try:
+        payload = jwt.decode(token, key, algorithms=jwt_cfg.ALGORITHMS)
     except JWTError as e:
         pytest.fail(f"Token validation failed: {e}")
+    assert payload["sub"] == TOKEN_SUBJECT
+    # Issued at a frozen instant, so expiry is exactly ACCESS_TOKEN_EXPIRE_MINUTES later
+    assert payload["exp"] == expected_expiry
 
-def test_access_token_expiration():
-    """Test that an expired JWT access token is invalid."""
-    subject = "test_user_for_expiry"
-    # Create a token that expires very quickly (e.g., -1 minute)
-    expired_token = create_access_token(subject=subject, expires_delta=datetime.timedelta(minutes=-1))
-
-    with pytest.raises(JWTError):
-        jwt.decode(
-            expired_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-
-def test_access_token_invalid_signature():
-    """Test that a JWT token with an invalid signature is rejected."""
-    subject = "test_user_invalid_sig"
-    token = create_access_token(subject=subject)
-
-    wrong_secret_key = "a_totally_different_secret_key_that_is_long_enough"
-    with pytest.raises(JWTError):
-        jwt.decode(token, wrong_secret_key, algorithms=[settings.ALGORITHM])
+def test_access_token_expiration(jwt_cfg, access_token):
+    """Test that an access token is rejected once its expiry has passed."""
+    token, expected_expiry = access_token
 
-def test_access_token_malformed():
-    """Test that a malformed JWT token is rejected."""
-    malformed_token = "this.is.not.a.valid.token"
-    with pytest.raises(JWTError):
-        jwt.decode(malformed_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    with time_machine.travel(expected_expiry + 1, tick=False):
+        with pytest.raises(JWTError):
+            jwt.decode(token, jwt_cfg.SECRET_KEY, algorithms=jwt_cfg.ALGORITHMS)
 
-def test_access_token_no_subject():
+def test_access_token_no_subject(jwt_cfg):
     """Test creating a token with no subject (should still work, sub will be None or handled by create_access_token)."""
     # Assuming create_access_token can handle subject=None or uses a default.
     # If subject is mandatory and not None, this test might need adjustment
@@ -101,10 +130,51 @@ def test_access_token_no_subject():
     assert token_no_sub is not None
     try:
         payload = jwt.decode(
-            token_no_sub, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token_no_sub, jwt_cfg.SECRET_KEY, algorithms=jwt_cfg.ALGORITHMS
         )
         # Depending on implementation, sub might be None, an empty string, or not present.
         # If it's not present, payload.get("sub") is safer than payload["sub"]
         assert payload.get("sub") is None # Or check for expected default if any
     except JWTError as e:
-        pytest.fail(f"Token validation for no subject failed: {e}") 
\ No newline at end of file
+        pytest.fail(f"Token validation for no subject failed: {e}") 
+
+@pytest.mark.asyncio
+async def test_decode_token_uses_cache_and_rechecks_expiry(monkeypatch):
+    """Test that decode_token serves repeats from its cache but still honours exp."""
+    clear_token_cache()
+    token = create_access_token(subject="cached_subject")
+
+    assert await decode_token("this.is.not.a.valid.token") is None
+    assert await decode_token(token) == "cached_subject"
+
+    # A cache hit must not re-verify the signature.
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("jwt.decode should not be called on a cache hit")
+
+    monkeypatch.setattr(jwt, "decode", fail_decode)
+    assert await decode_token(token) == "cached_subject"
+
+    # Once the token's exp has passed, the cached payload is rejected.
+    monkeypatch.setattr(time, "time", lambda: 2**40)
+    assert await decode_token(token) is None
+
+
+@pytest.mark.asyncio
+async def test_decode_token_without_exp_is_stable_across_cache_hits(jwt_cfg):
+    """Test that a token without exp decodes the same on a miss and a cache hit."""
+    clear_token_cache()
+    token = jwt.encode({"sub": "no_exp_subject"}, jwt_cfg.SECRET_KEY, algorithm=jwt_cfg.ALGORITHMS[0])
+
+    assert await decode_token(token) == "no_exp_subject"
+    assert await decode_token(token) == "no_exp_subject"
+
+
+@pytest.mark.asyncio
+async def test_decode_token_cache_does_not_survive_key_change(monkeypatch):
+    """Test that payloads cached under one SECRET_KEY are not served under another."""
+    clear_token_cache()
+    token = create_access_token(subject="rotated_subject")
+    assert await decode_token(token) == "rotated_subject"
+
+    monkeypatch.setattr(settings, "SECRET_KEY", WRONG_SECRET_KEY)
+    assert await decode_token(token) is None